@@ -0,0 +1,337 @@
+import json
+import math
+from bisect import bisect_right
+from pathlib import Path
+
+import numpy as np
+import CoolProp
+from scipy.interpolate import BSpline, CubicSpline, RectBivariateSpline
+
+
+class CoolPropBackend:
+    """
+    Stoffwerte direkt aus CoolProp (Referenz). Temperaturen in K, Drücke in Pa, SI-Einheiten.
+    Verwendet ein wiederverwendetes AbstractState-Objekt statt PropsSI; Eingaben dürfen Arrays sein.
+    Skalare Aufrufe melden Fehler wie PropsSI mit ValueError, in Arrays werden solche Punkte NaN.
+    """
+
+    def __init__(self, fluid: str = 'R290'):
+        self.fluid = fluid
+        self.state = CoolProp.AbstractState('HEOS', fluid)
+
+    def _evaluate(self, input_pair, output, value1, value2):
+        state = self.state
+        if np.ndim(value1) == 0 and np.ndim(value2) == 0:
+            state.update(input_pair, value1, value2)
+            return state.keyed_output(output)
+        value1, value2 = np.broadcast_arrays(value1, value2)
+        result = np.empty(value1.shape)
+        for i, (v1, v2) in enumerate(zip(value1.flat, value2.flat)):
+            try:
+                state.update(input_pair, v1, v2)
+                result.flat[i] = state.keyed_output(output)
+            except ValueError:
+                result.flat[i] = np.nan
+        return result
+
+    def p_sat(self, T):
+        return self._evaluate(CoolProp.QT_INPUTS, CoolProp.iP, 0.5, T)
+
+    def h_pt(self, p, T):
+        return self._evaluate(CoolProp.PT_INPUTS, CoolProp.iHmass, p, T)
+
+    def d_pt(self, p, T):
+        return self._evaluate(CoolProp.PT_INPUTS, CoolProp.iDmass, p, T)
+
+    def s_pt(self, p, T):
+        return self._evaluate(CoolProp.PT_INPUTS, CoolProp.iSmass, p, T)
+
+    def h_ps(self, p, s):
+        return self._evaluate(CoolProp.PSmass_INPUTS, CoolProp.iHmass, p, s)
+
+    def t_ph(self, p, h):
+        return self._evaluate(CoolProp.HmassP_INPUTS, CoolProp.iT, h, p)
+
+    def h_liquid(self, p):
+        return self._evaluate(CoolProp.PQ_INPUTS, CoolProp.iHmass, p, 0.0)
+
+
+class _CubicPieces:
+    """ CubicSpline für skalare Abfragen: Koeffizienten je Intervall als Listen, Auswertung mit float. """
+
+    def __init__(self, spline: CubicSpline):
+        self.breaks = spline.x.tolist()
+        self.coefficients = spline.c.T.tolist()
+        self.last = len(self.coefficients) - 1
+
+    def __call__(self, x: float) -> float:
+        i = min(max(bisect_right(self.breaks, x) - 1, 0), self.last)  # außerhalb wie CubicSpline extrapoliert
+        c0, c1, c2, c3 = self.coefficients[i]
+        dx = x - self.breaks[i]
+        return c3 + dx * (c2 + dx * (c1 + dx * c0))
+
+
+class _BicubicPatches:
+    """
+    Kubischer RectBivariateSpline als Polynom je Knotenrechteck, Entwicklung um die Rechteckmitte,
+    für skalare Abfragen ohne fitpack. Innerhalb eines Rechtecks ist der Spline bikubisch, die
+    Umrechnung über die Ableitungen in der Mitte ist daher exakt (bis auf Rundung).
+    """
+
+    def __init__(self, spline: RectBivariateSpline):
+        tx, ty, c = spline.tck
+        c = c.reshape(len(tx) - 4, len(ty) - 4)
+        self.x_breaks = np.unique(tx).tolist()
+        self.y_breaks = np.unique(ty).tolist()
+        x_mid = 0.5 * (np.unique(tx)[1:] + np.unique(tx)[:-1])
+        y_mid = 0.5 * (np.unique(ty)[1:] + np.unique(ty)[:-1])
+        # zuerst in x: je Rechteckspalte die Taylor-Koeffizienten a als B-Spline-Koeffizienten in y
+        along_x = BSpline(tx, c, 3)
+        cx = np.stack([along_x(x_mid, nu=a) / math.factorial(a) for a in range(4)], axis=1)  # (nx, 4, ny_c)
+        along_y = BSpline(ty, np.moveaxis(cx, 2, 0), 3)
+        cxy = np.stack([along_y(y_mid, nu=b) / math.factorial(b) for b in range(4)], axis=-1)  # (ny, nx, 4, 4)
+        self.coefficients = np.ascontiguousarray(np.moveaxis(cxy, 0, 1)).reshape(len(x_mid), len(y_mid), 16)
+        self.x_mid = x_mid.tolist()
+        self.y_mid = y_mid.tolist()
+        self.x_last = len(x_mid) - 1
+        self.y_last = len(y_mid) - 1
+
+    def __call__(self, x: float, y: float) -> float:
+        i = min(max(bisect_right(self.x_breaks, x) - 1, 0), self.x_last)
+        j = min(max(bisect_right(self.y_breaks, y) - 1, 0), self.y_last)
+        c = self.coefficients[i, j].tolist()
+        dx = x - self.x_mid[i]
+        dy = y - self.y_mid[j]
+        r0 = c[0] + dy * (c[1] + dy * (c[2] + dy * c[3]))
+        r1 = c[4] + dy * (c[5] + dy * (c[6] + dy * c[7]))
+        r2 = c[8] + dy * (c[9] + dy * (c[10] + dy * c[11]))
+        r3 = c[12] + dy * (c[13] + dy * (c[14] + dy * c[15]))
+        return r0 + dx * (r1 + dx * (r2 + dx * r3))
+
+
+def _is_scalar(*values) -> bool:
+    return all(isinstance(v, (int, float)) for v in values)
+
+
+class TabulatedBackend:
+    """
+    Tabellierte Stoffwerte für überhitzten Dampf als Ersatz für PropsSI in corrSH_PolyScroll.
+    Sättigungskurven als kubische Splines über ln(p), bikubische Tabellen über
+    (ln p, T - Tsat), (ln p, s - s'') und (ln p, h - h''). Die Tabellen werden einmal mit
+    CoolProp erzeugt und als .npz zwischengespeichert; Punkte außerhalb der Tabellen
+    (z.B. Nassdampf) werden exakt mit CoolProp gerechnet.
+
+    Genauigkeit (R290, Standardgitter, gegen CoolProp HEOS an zufälligen Zwischengitterpunkten):
+    relative Fehler von h(p, T), s(p, T) und d(p, T) < 1e-6, h(p, s) und T(p, h) < 5e-6, p_sat < 1e-9.
+    Die beim Erzeugen gemessenen Maximalfehler stehen in self.accuracy.
+    Skalare Abfragen (int/float) werten vorberechnete Polynomstücke mit float aus, ohne scipy-Aufruf.
+    """
+
+    def __init__(self, fluid: str = 'R290', t_sat_range=(-45.0, 88.0), superheat_max: float = 150.0,
+                 n_pressure: int = 120, n_superheat: int = 151, cache_dir=None):
+        self.fluid = fluid
+        self.exact = CoolPropBackend(fluid)
+        self.meta = {"fluid": fluid, "t_sat_range": list(t_sat_range), "superheat_max": superheat_max,
+                     "n_pressure": n_pressure, "n_superheat": n_superheat, "coolprop": CoolProp.__version__}
+
+        cache_dir = Path(cache_dir) if cache_dir is not None else Path(__file__).parent / 'property_tables'
+        cache_file = cache_dir / f'{fluid}_property_tables.npz'
+        tables = self._read_cache(cache_file)
+        if tables is None:
+            tables = self._build_tables()
+            cache_dir.mkdir(exist_ok=True)
+            np.savez(cache_file, meta=json.dumps(self.meta), **tables)
+        self._set_tables(tables)
+
+    def _read_cache(self, cache_file: Path):
+        if not cache_file.exists():
+            return None
+        with np.load(cache_file) as data:
+            if json.loads(str(data["meta"])) != self.meta:
+                return None
+            return {name: data[name] for name in data.files if name != "meta"}
+
+    def _build_tables(self) -> dict:
+        """ Erzeugt alle Tabellen mit dem CoolProp Low-Level-Interface. """
+        state = CoolProp.AbstractState('HEOS', self.fluid)
+        t_lo, t_hi = (t + 273.15 for t in self.meta["t_sat_range"])
+        state.update(CoolProp.QT_INPUTS, 1.0, t_lo)
+        x_lo = np.log(state.p())
+        state.update(CoolProp.QT_INPUTS, 1.0, t_hi)
+        x_hi = np.log(state.p())
+        x = np.linspace(x_lo, x_hi, self.meta["n_pressure"])
+        superheat = np.linspace(0.0, self.meta["superheat_max"], self.meta["n_superheat"])
+
+        # Sättigung (dichter, 1-D) über ln(p) und über T
+        x_sat = np.linspace(x_lo, x_hi, 4 * self.meta["n_pressure"])
+        sat = np.empty((len(x_sat), 4))
+        for i, xi in enumerate(x_sat):
+            state.update(CoolProp.PQ_INPUTS, np.exp(xi), 1.0)
+            sat[i, :3] = state.T(), state.hmass(), state.smass()
+            state.update(CoolProp.PQ_INPUTS, np.exp(xi), 0.0)
+            sat[i, 3] = state.hmass()
+
+        # (ln p, T - Tsat) -> h, ln d, s
+        t_sat = CubicSpline(x_sat, sat[:, 0])(x)
+        pt = np.empty((len(x), len(superheat), 3))
+        for i, xi in enumerate(x):
+            for j, dt in enumerate(superheat):
+                if j == 0:
+                    state.update(CoolProp.PQ_INPUTS, np.exp(xi), 1.0)
+                else:
+                    state.update(CoolProp.PT_INPUTS, np.exp(xi), t_sat[i] + dt)
+                pt[i, j] = state.hmass(), np.log(state.rhomass()), state.smass()
+
+        # (ln p, s - s'') -> h und (ln p, h - h'') -> T, Bereich so, dass alle Zeilen im Tabellenbereich liegen
+        s_span = np.min(pt[:, -1, 2] - pt[:, 0, 2])
+        h_span = np.min(pt[:, -1, 0] - pt[:, 0, 0])
+        ds = np.linspace(0.0, s_span, len(superheat))
+        dh = np.linspace(0.0, h_span, len(superheat))
+        ps = np.empty((len(x), len(superheat)))
+        ph = np.empty((len(x), len(superheat)))
+        for i, xi in enumerate(x):
+            for j in range(len(superheat)):
+                if j == 0:
+                    state.update(CoolProp.PQ_INPUTS, np.exp(xi), 1.0)
+                    ps[i, j] = state.hmass()
+                    ph[i, j] = state.T()
+                    continue
+                state.update(CoolProp.PSmass_INPUTS, np.exp(xi), pt[i, 0, 2] + ds[j])
+                ps[i, j] = state.hmass()
+                state.update(CoolProp.HmassP_INPUTS, pt[i, 0, 0] + dh[j], np.exp(xi))
+                ph[i, j] = state.T()
+
+        tables = {"x": x, "superheat": superheat, "ds": ds, "dh": dh, "x_sat": x_sat, "sat": sat,
+                  "pt": pt, "ps": ps, "ph": ph}
+        self._set_tables(tables)
+        tables["accuracy"] = self._measure_accuracy()
+        return tables
+
+    def _set_tables(self, tables: dict):
+        self.tables = tables
+        x, x_sat, sat = tables["x"], tables["x_sat"], tables["sat"]
+        self._x_lo, self._x_hi = x[0], x[-1]
+        self._t_sat = CubicSpline(x_sat, sat[:, 0])
+        self._h_vap = CubicSpline(x_sat, sat[:, 1])
+        self._s_vap = CubicSpline(x_sat, sat[:, 2])
+        self._h_liq = CubicSpline(x_sat, sat[:, 3])
+        self._ln_p_sat = CubicSpline(sat[:, 0], x_sat)
+        self._t_lo, self._t_hi = sat[0, 0], sat[-1, 0]
+        self._scalar_t_sat, self._scalar_h_vap, self._scalar_s_vap, self._scalar_h_liq, self._scalar_ln_p_sat = (
+            _CubicPieces(spline) for spline in (self._t_sat, self._h_vap, self._s_vap, self._h_liq, self._ln_p_sat))
+
+        superheat, ds, dh = tables["superheat"], tables["ds"], tables["dh"]
+        self._limits = {"pt": superheat[-1], "ps": ds[-1], "ph": dh[-1]}
+        self._h_pt = RectBivariateSpline(x, superheat, tables["pt"][:, :, 0])
+        self._ln_d_pt = RectBivariateSpline(x, superheat, tables["pt"][:, :, 1])
+        self._s_pt = RectBivariateSpline(x, superheat, tables["pt"][:, :, 2])
+        self._h_ps = RectBivariateSpline(x, ds, tables["ps"])
+        self._t_ph = RectBivariateSpline(x, dh, tables["ph"])
+        self._scalar_h_pt, self._scalar_ln_d_pt, self._scalar_s_pt, self._scalar_h_ps, self._scalar_t_ph = (
+            _BicubicPatches(spline) for spline in (self._h_pt, self._ln_d_pt, self._s_pt, self._h_ps, self._t_ph))
+        if "accuracy" in tables:
+            self.accuracy = dict(zip(("p_sat", "h_pt", "d_pt", "s_pt", "h_ps", "t_ph"),
+                                     np.asarray(tables["accuracy"]).tolist()))
+
+    def _measure_accuracy(self, n: int = 400) -> np.ndarray:
+        """ Maximale relative Abweichung gegenüber CoolProp an zufälligen Punkten im Tabellenbereich. """
+        rng = np.random.default_rng(0)
+        exact = self.exact
+        t_lo, t_hi = (t + 273.15 for t in self.meta["t_sat_range"])
+        T_sat = rng.uniform(t_lo, t_hi, n)
+        p = exact.p_sat(T_sat)
+        T = T_sat + rng.uniform(0.5, self.meta["superheat_max"] - 0.5, n)
+        s, h, d = exact.s_pt(p, T), exact.h_pt(p, T), exact.d_pt(p, T)
+        inside_ps = (s - self._s_vap(np.log(p)) <= self._limits["ps"])
+        inside_ph = (h - self._h_vap(np.log(p)) <= self._limits["ph"])
+
+        def rel(a, b):
+            return float(np.max(np.abs(a / b - 1.0)))
+
+        return np.array([rel(self.p_sat(T_sat), p), rel(self.h_pt(p, T), h), rel(self.d_pt(p, T), d),
+                         rel(self.s_pt(p, T), s), rel(self.h_ps(p[inside_ps], s[inside_ps]), h[inside_ps]),
+                         rel(self.t_ph(p[inside_ph], h[inside_ph]), T[inside_ph])])
+
+    def _lookup(self, spline, x, y, limit, exact, *args):
+        """ Tabellenwert für (x, y); Punkte außerhalb der Tabelle werden exakt gerechnet. """
+        x, y = np.broadcast_arrays(x, y)
+        result = np.array(spline.ev(x, y), dtype=float)
+        outside = ~((x >= self._x_lo) & (x <= self._x_hi) & (y >= 0.0) & (y <= limit))
+        if outside.any():
+            result[outside] = exact(*(np.broadcast_to(a, x.shape)[outside] for a in args))
+        return result if result.ndim else float(result)
+
+    def _lookup_scalar(self, patches, x, y, limit, exact, *args):
+        """ Wie _lookup für einen Punkt. """
+        if self._x_lo <= x <= self._x_hi and 0.0 <= y <= limit:
+            return patches(x, y)
+        return float(exact(*args))
+
+    def p_sat(self, T):
+        if _is_scalar(T):
+            if self._t_lo <= T <= self._t_hi:
+                return math.exp(self._scalar_ln_p_sat(T))
+            return float(self.exact.p_sat(T))
+        T = np.asarray(T, dtype=float)
+        result = np.exp(self._ln_p_sat(T))
+        outside = ~((T >= self._t_lo) & (T <= self._t_hi))
+        if outside.any():
+            result[outside] = self.exact.p_sat(T[outside])
+        return result if result.ndim else float(result)
+
+    def h_pt(self, p, T):
+        if _is_scalar(p, T):
+            x = math.log(p)
+            return self._lookup_scalar(self._scalar_h_pt, x, T - self._scalar_t_sat(x), self._limits["pt"],
+                                       self.exact.h_pt, p, T)
+        x = np.log(np.asarray(p, dtype=float))
+        return self._lookup(self._h_pt, x, T - self._t_sat(x), self._limits["pt"], self.exact.h_pt, p, T)
+
+    def d_pt(self, p, T):
+        if _is_scalar(p, T):
+            x = math.log(p)
+            y = T - self._scalar_t_sat(x)
+            if self._x_lo <= x <= self._x_hi and 0.0 <= y <= self._limits["pt"]:
+                return math.exp(self._scalar_ln_d_pt(x, y))
+            return float(self.exact.d_pt(p, T))
+        x = np.log(np.asarray(p, dtype=float))
+        ln_d = self._lookup(self._ln_d_pt, x, T - self._t_sat(x), self._limits["pt"],
+                            lambda pi, Ti: np.log(self.exact.d_pt(pi, Ti)), p, T)
+        return np.exp(ln_d)
+
+    def s_pt(self, p, T):
+        if _is_scalar(p, T):
+            x = math.log(p)
+            return self._lookup_scalar(self._scalar_s_pt, x, T - self._scalar_t_sat(x), self._limits["pt"],
+                                       self.exact.s_pt, p, T)
+        x = np.log(np.asarray(p, dtype=float))
+        return self._lookup(self._s_pt, x, T - self._t_sat(x), self._limits["pt"], self.exact.s_pt, p, T)
+
+    def h_ps(self, p, s):
+        if _is_scalar(p, s):
+            x = math.log(p)
+            return self._lookup_scalar(self._scalar_h_ps, x, s - self._scalar_s_vap(x), self._limits["ps"],
+                                       self.exact.h_ps, p, s)
+        x = np.log(np.asarray(p, dtype=float))
+        return self._lookup(self._h_ps, x, s - self._s_vap(x), self._limits["ps"], self.exact.h_ps, p, s)
+
+    def t_ph(self, p, h):
+        if _is_scalar(p, h):
+            x = math.log(p)
+            return self._lookup_scalar(self._scalar_t_ph, x, h - self._scalar_h_vap(x), self._limits["ph"],
+                                       self.exact.t_ph, p, h)
+        x = np.log(np.asarray(p, dtype=float))
+        return self._lookup(self._t_ph, x, h - self._h_vap(x), self._limits["ph"], self.exact.t_ph, p, h)
+
+    def h_liquid(self, p):
+        if _is_scalar(p):
+            x = math.log(p)
+            if self._x_lo <= x <= self._x_hi:
+                return self._scalar_h_liq(x)
+            return float(self.exact.h_liquid(p))
+        x = np.log(np.asarray(p, dtype=float))
+        result = self._h_liq(x)
+        outside = ~((x >= self._x_lo) & (x <= self._x_hi))
+        if outside.any():
+            result[outside] = self.exact.h_liquid(np.asarray(p, dtype=float)[outside])
+        return result if result.ndim else float(result)
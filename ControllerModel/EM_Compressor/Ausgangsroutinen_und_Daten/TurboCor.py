@@ -1,9 +1,247 @@
-import numpy as np
-import pandas as pd
-from scipy.interpolate import griddata
+# Zur Laufzeit genügt NumPy: pandas (Lesen der CSV-Dateien) und CoolProp/scipy (RefrigerantTables) werden erst
+# importiert, wenn eine CSV ohne gültigen Zwischenspeicher gelesen bzw. corrSH_PolyScroll ohne Stoffwert-Backend
+# erzeugt wird. Importzeiten je Pfad: EM_Compressor_benchmark.py
+# RefrigerantTables und EM_Compressor (CompressorOutput für evaluate) werden über _project_module geladen, das
+# funktioniert im Paket ControllerModel.EM_Compressor ebenso wie beim Import als Skript aus diesem Ordner.
+import hashlib
+import importlib
+import importlib.util
+import io
+import json
 import os
+import sys
+import tempfile
+from functools import cached_property
+from typing import TYPE_CHECKING
+import numpy as np
 from pathlib import Path
-from CoolProp.CoolProp import PropsSI
+
+if TYPE_CHECKING:
+    from ControllerModel.EM_Compressor.EM_Compressor import CompressorOutput
+
+# CSV-Dateien relativ zu diesem Modul, unabhängig vom Arbeitsverzeichnis
+MODULE_DIRECTORY = Path(__file__).resolve().parent
+DATA_DIRECTORY = MODULE_DIRECTORY.parent / 'Datenfiles'
+
+# Gitter der TurboCor-Tabellen: Verdampfung -18..30 °C in 3 K, Kondensation -5..70 °C in 2.5 K
+T_SUCTION_STEP = 3.0
+T_CONDENSATION_STEP = 2.5
+
+
+def _project_module(relative_name: str):
+    """ Modul relativ zu diesem, z.B. '.RefrigerantTables' oder '..EM_Compressor'. Im Paket als relativer
+        Import; als Skript (dieser Ordner im Suchpfad) über den Dateipfad unter dem einfachen Modulnamen,
+        ein bereits importiertes Modul gleichen Namens wird wiederverwendet """
+    if __package__:
+        return importlib.import_module(relative_name, __package__)
+    name = relative_name.lstrip('.')
+    module = sys.modules.get(name)
+    if module is None:
+        levels = len(relative_name) - len(name) - 1  # '.' = dieser Ordner, '..' = eine Ebene höher
+        directory = MODULE_DIRECTORY.parents[levels - 1] if levels else MODULE_DIRECTORY
+        spec = importlib.util.spec_from_file_location(name, directory / (name + '.py'))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[name]
+            raise
+    return module
+
+
+def _file_sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _replace_file(path: Path, data: bytes):
+    """ Schreibt über eine temporäre Datei im selben Verzeichnis, path wird erst vollständig ersetzt (os.replace) """
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _read_table_cache(fcsv: Path, cache_file: Path, meta_file: Path, meta: dict):
+    """ Zwischengespeicherter Tensor zu read_table_csv oder None, wenn er nicht zur CSV passt """
+    with open(meta_file, 'r') as f:
+        cached = json.load(f)
+    if not all(cached.get(key) == meta[key] for key in ("size", "nrows", "shape")):
+        return None
+    sha256 = cached.get("sha256")
+    if cached.get("mtime_ns") != meta["mtime_ns"] and _file_sha256(fcsv) != sha256:
+        return None
+    table = np.load(cache_file, mmap_mode='r')
+    if table.shape != tuple(meta["shape"]):
+        return None
+    if cached.get("mtime_ns") != meta["mtime_ns"]:
+        try:
+            _replace_file(meta_file, json.dumps(dict(meta, sha256=sha256)).encode())
+        except OSError as e:
+            print(f"read_table_csv: {meta_file} nicht aktualisiert ({e})")
+    return table
+
+
+def read_table_csv(fcsv, nrows: int, shape) -> np.ndarray:
+    """ Liest eine TurboCor-CSV (header=9, sep=';') als Tensor der Form shape.
+        Der Tensor wird als <csv>.npy neben der CSV zwischengespeichert und memory-mapped (nur lesend) geladen.
+        Gültig ist der Zwischenspeicher bei gleicher Änderungszeit und Größe der CSV oder, falls sich nur die
+        Änderungszeit geändert hat, bei gleichem SHA-256; sonst wird die CSV neu gelesen.
+        Nicht numerische Einträge werden im Zwischenspeicher NaN. Ein nicht lesbarer oder beschädigter
+        Zwischenspeicher gilt als ungültig; ist er nicht schreibbar, wird der gelesene Tensor (ebenfalls nur
+        lesend) zurückgegeben """
+    fcsv = Path(fcsv)
+    cache_file = fcsv.with_name(fcsv.name + '.npy')
+    meta_file = fcsv.with_name(fcsv.name + '.json')
+    stat = fcsv.stat()
+    meta = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "nrows": nrows, "shape": list(shape)}
+
+    try:
+        table = _read_table_cache(fcsv, cache_file, meta_file, meta)
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        table = None  # fehlender oder beschädigter Zwischenspeicher: CSV neu lesen
+    if table is not None:
+        return table
+
+    import pandas as pd
+    pddata = pd.read_csv(fcsv, header=9, sep=';', nrows=nrows)
+    if not all(pd.api.types.is_numeric_dtype(dtype) for dtype in pddata.dtypes):
+        pddata = pddata.apply(pd.to_numeric, errors='coerce')
+    table = pddata.to_numpy(dtype=float, copy=True).reshape(shape)
+    table.setflags(write=False)
+    npy = io.BytesIO()
+    np.save(npy, table)
+    try:
+        # zuerst der Tensor, dann die Metadaten: fehlen diese, wird die CSV beim nächsten Mal neu gelesen
+        _replace_file(cache_file, npy.getvalue())
+        _replace_file(meta_file, json.dumps(dict(meta, sha256=_file_sha256(fcsv))).encode())
+    except OSError as e:
+        print(f"read_table_csv: Zwischenspeicher {cache_file} nicht geschrieben ({e})")
+        return table
+    return np.load(cache_file, mmap_mode='r')
+
+
+def interpolate_table(rs, t_suction, t_condensation):
+    """ Bilineare Interpolation aller 38 Werte (Spalten 1..38) einer (17, 31, 39)-Tabelle im Betriebspunkt.
+        Liefert None, wenn der Punkt außerhalb liegt oder eine Ecke keinen Massenstrom (Spalte 14) hat """
+    if not (-17.99 <= t_suction <= 30 and -5 <= t_condensation <= 69.99):
+        return None  # temperatures out of range
+    id = min(int((t_suction + 18) / T_SUCTION_STEP), rs.shape[0] - 2)
+    jd = min(int((t_condensation + 5) / T_CONDENSATION_STEP), rs.shape[1] - 2)
+    cell = rs[id:id + 2, jd:jd + 2]
+    if not cell[:, :, 14].all():
+        return None  # massflow zero means no valid result from compressor in this point
+    w11 = cell[0, 0, 1:] + (cell[1, 0, 1:] - cell[0, 0, 1:]) / T_SUCTION_STEP * (t_suction - cell[0, 0, 1])
+    w12 = cell[0, 1, 1:] + (cell[1, 1, 1:] - cell[0, 1, 1:]) / T_SUCTION_STEP * (t_suction - cell[0, 1, 1])
+    return w11 + (w12 - w11) / T_CONDENSATION_STEP * (t_condensation - cell[0, 0, 2])
+
+
+def interpolate_table_batch(rs, t_suction, t_condensation):
+    """ Wie interpolate_table für Arrays von Betriebspunkten (Broadcasting, flach gelegt).
+        Ergebnis: (values (N, 38), valid (N,)), ungültige Zeilen sind NaN """
+    t_suction, t_condensation = (np.ravel(a).astype(float) for a in np.broadcast_arrays(t_suction, t_condensation))
+    n_suction, n_condensation = rs.shape[-3:-1]
+    in_range = (t_suction >= -17.99) & (t_suction <= 30) & (t_condensation >= -5) & (t_condensation <= 69.99)
+    with np.errstate(invalid='ignore'):
+        id = np.clip(((t_suction + 18) / T_SUCTION_STEP).astype(int), 0, n_suction - 2)
+        jd = np.clip(((t_condensation + 5) / T_CONDENSATION_STEP).astype(int), 0, n_condensation - 2)
+
+    # die vier Ecken der Zelle je Punkt in einem Zugriff: (N, 4, 39) in der Reihenfolge 00, 10, 01, 11
+    cells = rs.reshape(n_suction * n_condensation, rs.shape[-1])
+    corners = cells[(id * n_condensation + jd)[:, np.newaxis] + np.array([0, n_condensation, 1, n_condensation + 1])]
+    # massflow zero means no valid result from compressor in this point
+    valid = in_range & (corners[:, :, 14] != 0).all(axis=1)
+
+    ws1 = (t_suction - corners[:, 0, 1]) / T_SUCTION_STEP
+    ws2 = (t_suction - corners[:, 2, 1]) / T_SUCTION_STEP
+    wc = (t_condensation - corners[:, 0, 2]) / T_CONDENSATION_STEP
+    weights = np.stack(((1 - ws1) * (1 - wc), ws1 * (1 - wc), (1 - ws2) * wc, ws2 * wc), axis=1)
+    values = np.matmul(weights[:, np.newaxis, :], corners)[:, 0, 1:]
+    values[~valid] = np.nan
+    return values, valid
+
+
+def interpolate_frompower(tables, frompower, t_suction, t_condensation):
+    """ Trilineare Interpolation (Leistung, Verdampfung, Kondensation) in einem Schritt über eine Folge von
+        frompower-Tabellen der Form (5, 17, 31, 39), siehe TurboCor.stack_frompower. Ab 100 % sind beide
+        Leistungsstufen die Stufe 100 %, d.h. der Wert wird dort nicht extrapoliert.
+        Verwendet wird die erste Tabelle, deren Zelle an allen acht Ecken Massenstrom hat.
+        Liefert (values (38,), Index der Tabelle) oder None, wenn keine Tabelle gültig ist """
+    if not (-17.99 <= t_suction <= 30 and -5 <= t_condensation <= 69.99):
+        return None  # temperatures out of range
+    n_power, n_suction, n_condensation = tables[0].shape[:3]
+    id1 = min(max(int(frompower / 25.0), 0), n_power - 1)
+    powers = slice(id1, id1 + 2) if id1 < n_power - 1 else [id1, id1]
+    id = min(int((t_suction + 18) / T_SUCTION_STEP), n_suction - 2)
+    jd = min(int((t_condensation + 5) / T_CONDENSATION_STEP), n_condensation - 2)
+    for k, table in enumerate(tables):
+        cell = table[powers, id:id + 2, jd:jd + 2]  # (2, 2, 2, 39)
+        # massflow zero means no valid result from compressor in this point
+        if cell[..., 14].all():
+            break
+    else:
+        return None
+    w11 = cell[:, 0, 0, 1:] + (cell[:, 1, 0, 1:] - cell[:, 0, 0, 1:]) / T_SUCTION_STEP * (t_suction - cell[:, 0, 0, 1:2])
+    w12 = cell[:, 0, 1, 1:] + (cell[:, 1, 1, 1:] - cell[:, 0, 1, 1:]) / T_SUCTION_STEP * (t_suction - cell[:, 0, 1, 1:2])
+    vec = w11 + (w12 - w11) / T_CONDENSATION_STEP * (t_condensation - cell[:, 0, 0, 2:3])
+    return vec[0] + (vec[1] - vec[0]) / 25.0 * (frompower - 25.0 * id1), k
+
+
+def interpolate_frompower_batch(tables, frompower, t_suction, t_condensation):
+    """ Wie interpolate_frompower für Arrays von Betriebspunkten. Die Gültigkeit wird für alle Tabellen über
+        die Massenstrom-Spalte maskiert, die acht Ecken (Leistung, Verdampfung, Kondensation) werden nur aus der
+        ersten gültigen Tabelle gesammelt (nur für gültige Punkte) und mit einem Matrixprodukt gewichtet.
+        Leistungen außerhalb 0..100 % werden wie dort aus der Randstufe linear extrapoliert.
+        Ergebnis: (values (N, 38), valid (N,), Index der Tabelle (N,)), ungültige Zeilen sind NaN """
+    frompower, t_suction, t_condensation = (np.ravel(a).astype(float) for a in
+                                            np.broadcast_arrays(frompower, t_suction, t_condensation))
+    n_power, n_suction, n_condensation, n_columns = tables[0].shape
+    in_range = (t_suction >= -17.99) & (t_suction <= 30) & (t_condensation >= -5) & (t_condensation <= 69.99) & \
+        np.isfinite(frompower)
+    with np.errstate(invalid='ignore'):
+        id1 = np.clip((frompower / 25.0).astype(int), 0, n_power - 1)
+        id = np.clip(((t_suction + 18) / T_SUCTION_STEP).astype(int), 0, n_suction - 2)
+        jd = np.clip(((t_condensation + 5) / T_CONDENSATION_STEP).astype(int), 0, n_condensation - 2)
+
+    # acht Ecken je Punkt: Leistungsstufe id1 (00, 10, 01, 11), dann id1 + 1 (ab 100 % nochmals id1)
+    slice_size = n_suction * n_condensation
+    offsets = np.array([0, n_condensation, 1, n_condensation + 1])
+    base = id * n_condensation + jd
+    corner = np.concatenate(((id1 * slice_size + base)[:, np.newaxis] + offsets,
+                             (np.minimum(id1 + 1, n_power - 1) * slice_size + base)[:, np.newaxis] + offsets), axis=1)
+    cells = [t.reshape(-1, n_columns) for t in tables]  # Sichten, gesammelt werden nur die benötigten Ecken
+    # massflow zero means no valid result from compressor in this point
+    valid = np.stack([(c[:, 14][corner] != 0).all(axis=1) for c in cells], axis=1) & in_range[:, np.newaxis]
+    table = valid.argmax(axis=1)
+    valid = valid.any(axis=1)
+
+    wp = (frompower - 25.0 * id1) / 25.0
+    values = np.full((len(id1), n_columns - 1), np.nan)
+    for k, c in enumerate(cells):
+        rows = np.flatnonzero(valid & (table == k))
+        corners = c[corner[rows]]  # (n, 8, 39), jede Zeile nur aus ihrer Tabelle
+        ws = (t_suction[rows, np.newaxis] - corners[:, [0, 2, 4, 6], 1]) / T_SUCTION_STEP
+        wc = (t_condensation[rows, np.newaxis] - corners[:, [0, 4], 2]) / T_CONDENSATION_STEP
+        weights = np.stack(((1 - ws[:, 0::2]) * (1 - wc), ws[:, 0::2] * (1 - wc),
+                            (1 - ws[:, 1::2]) * wc, ws[:, 1::2] * wc), axis=2)  # (n, 2, 4)
+        weights = (weights * np.stack((1 - wp[rows], wp[rows]), axis=1)[:, :, np.newaxis]).reshape(len(rows), 1, 8)
+        values[rows] = np.matmul(weights, corners)[:, 0, 1:]
+    return values, valid, table
+
+
+def poly10_basis(t_suction, t_condensation) -> np.ndarray:
+    """ Basis der 10-Term-Standardpolynome (EN 12900) für Arrays von Betriebspunkten, Form (..., 10):
+        1, to, tc, to², to·tc, tc², to³, to²·tc, to·tc², tc³ """
+    if np.ndim(t_suction) == 0 and np.ndim(t_condensation) == 0:
+        ts, tc = float(t_suction), float(t_condensation)
+        return np.array((1.0, ts, tc, ts * ts, ts * tc, tc * tc, ts ** 3, ts * ts * tc, ts * tc * tc, tc ** 3))
+    ts, tc = np.broadcast_arrays(np.asarray(t_suction, dtype=float), np.asarray(t_condensation, dtype=float))
+    return np.stack((np.ones_like(ts), ts, tc, ts * ts, ts * tc, tc * tc,
+                     ts ** 3, ts * ts * tc, ts * tc * tc, tc ** 3), axis=-1)
 
 
 class Compressor:
@@ -20,173 +258,10 @@ class Compressor:
         return (self.enthalpy_discharge - self.enthalpy_liquid_subcooled) * self.massflow_discharge
 
 
-class TurboCor(Compressor):
-    """ Klasse TurboCor Kompressor von Danfoss
-        Daten sind aus der SW von Danfoss abgeleitet. Das Original-Excel von Danfoss wurde modifiziert.
-        Die Verdamfungstemperatur, die Kondensationstemperatur und die Leistung wurden mit und ohne Economizer in Schritten varriert
-        und anschliessend in eine csv Datei geschrieben.
-        Die Klasse TurboCor liest diese Dateien und interpoliert linear - mit und ohne Economizer und liefert das bessere Ergebnis
-        self.economizer wird dann gesetzt.
-    """
-
-    def __init__(self, fname: str):
-        # optimal data w/o Economizer
-        fcsv = Path("../Datenfiles", (fname + '-noEcon_0Power.csv'))
-        pddata = pd.read_csv(fcsv, header=9, sep=';', nrows=527)
-        linedat = pddata.to_numpy(copy=True)
-        self.zeropower_noecon_data = linedat.reshape(17, 31, 39)
-
-        fcsv = fname + '-Econ_0Power.csv'
-        pddata = pd.read_csv(fcsv, header=9, sep=';', nrows=527)
-        linedat = pddata.to_numpy(copy=True)
-        self.zeropower_econ_data = linedat.reshape(17, 31, 39)
-
-        fcsv = fname + '-noEcon_FromPower.csv'
-        pddata = pd.read_csv(fcsv, header=9, sep=';', nrows=2635)
-        linedat = pddata.to_numpy(copy=True)
-        self.frompower_noecon_data = linedat.reshape(5, 17, 31, 39)
-
-        fcsv = fname + '-Econ_FromPower.csv'
-        pddata = pd.read_csv(fcsv, header=9, sep=';', nrows=2635)
-        linedat = pddata.to_numpy(copy=True)
-        self.frompower_econ_data = linedat.reshape(5, 17, 31, 39)
-
-        valid = self.calculate_frompower(frompower=50.0, t_suction=0.0, t_condensation=37.5)
-        print("TurboCor Init: ", fname, "Minimum Power 50% 0 37.5 Grad: ", self.power_minimum(),
-              " Maximum Power: ", self.power_maximum())
-        self.economizer = 0
-
-    def calculate_0power_econ(self, t_suction, t_condensation):
-
-        idx = int((t_suction + 18) / 3)
-        jdx = int((t_condensation + 5) / 2.5)
-        vec0 = np.empty(38)
-        valid = 0
-
-        if -17.99 <= t_suction <= 30 and -5 <= t_condensation <= 69.99:
-            rs = self.zeropower_econ_data
-
-            if rs[idx, jdx, 14] != 0 and rs[idx + 1, jdx, 14] != 0 and rs[idx, jdx + 1, 14] != 0 and rs[
-                idx + 1, jdx + 1, 14] != 0:
-
-                for i in range(1, 39, 1):  # linear interpolation
-                    w11 = rs[idx, jdx, i] + (rs[idx + 1, jdx, i] - rs[idx, jdx, i]) / 3.0 * (
-                            t_suction - rs[idx, jdx, 1])
-                    w12 = rs[idx, jdx + 1, i] + (rs[idx + 1, jdx + 1, i] - rs[idx, jdx + 1, i]) / 3.0 * (
-                            t_suction - rs[idx, jdx + 1, 1])
-                    w23 = w11 + (w12 - w11) / 2.5 * (t_condensation - rs[idx, jdx, 2])
-                    vec0[i - 1] = w23
-                if vec0[10] != 0:
-                    self.actual_values = vec0
-                    valid = 1
-            else:
-                #   massflow zero means no valid result from compressor in this point
-                valid = 0
-        else:
-            valid = 0  # temperatures out of range
-        return valid
-
-    def calculate_0power_noecon(self, t_suction, t_condensation):
+class TurboCorValues:
+    """ Benannte Zugriffe auf den Ergebnisvektor actual_values (38 Werte) eines TurboCor-Betriebspunkts """
 
-        id = int((t_suction + 18) / 3)
-        jd = int((t_condensation + 5) / 2.5)
-        vec0 = np.empty(38)
-
-        if -17.99 <= t_suction <= 30 and -5 <= t_condensation <= 69.99:
-
-            rs = self.zeropower_noecon_data
-
-            if rs[id, jd, 14] != 0 and rs[id + 1, jd, 14] != 0 and rs[id, jd + 1, 14] != 0 and rs[
-                id + 1, jd + 1, 14] != 0:
-                for i in range(1, 39, 1):  # linear interpolation
-                    w11 = rs[id, jd, i] + (rs[id + 1, jd, i] - rs[id, jd, i]) / 3.0 * (t_suction - rs[id, jd, 1])
-                    w12 = rs[id, jd + 1, i] + (rs[id + 1, jd + 1, i] - rs[id, jd + 1, i]) / 3.0 * (
-                            t_suction - rs[id, jd + 1, 1])
-                    w23 = w11 + (w12 - w11) / 2.5 * (t_condensation - rs[id, jd, 2])
-                    vec0[i - 1] = w23
-                self.actual_values = vec0
-                valid = 1
-            else:
-                #   massflow zero means no valid result from compressor in this point
-                valid = 0
-        else:
-            valid = 0  # temperatures out of range
-        return valid
-
-    def calculate_0power(self, t_suction, t_condensation):
-        """ Liefert """
-        valid = self.calculate_0power_econ(t_suction, t_condensation)
-        if valid == 0:
-            valid = self.calculate_0power_noecon(t_suction, t_condensation)
-        return valid  # Results in self.actual_values_0Power
-
-    def get_values(self, t_suction, t_condensation, rs):
-        id = int((t_suction + 18) / 3)
-        jd = int((t_condensation + 5) / 2.5)
-        vec0 = np.empty(38)
-
-        if -17.99 <= t_suction <= 30 and -5 <= t_condensation <= 69.99:
-
-            if rs[id, jd, 14] != 0 and rs[id + 1, jd, 14] != 0 and rs[id, jd + 1, 14] != 0 and rs[
-                id + 1, jd + 1, 14] != 0:
-                for i in range(1, 39, 1):  # linear interpolation
-                    w11 = rs[id, jd, i] + (rs[id + 1, jd, i] - rs[id, jd, i]) / 3.0 * (t_suction - rs[id, jd, 1])
-                    w12 = rs[id, jd + 1, i] + (rs[id + 1, jd + 1, i] - rs[id, jd + 1, i]) / 3.0 * (
-                            t_suction - rs[id, jd + 1, 1])
-                    w23 = w11 + (w12 - w11) / 2.5 * (t_condensation - rs[id, jd, 2])
-                    vec0[i - 1] = w23
-                self.actual_values = vec0
-                valid = 1
-            else:
-                #   massflow zero means no valid result from compressor in this point
-                valid = 0
-        else:
-            valid = 0  # temperatures out of range
-        return valid
-
-    def calculate_zeropower(self, t_suction, t_condensation):
-
-        """ Bevorzugte Funktion:
-            Liefert valid = get_values für alle Daten des Betriebspunkt zeropower = optimale Effizienz
-        """
-
-        valid = self.get_values(t_suction, t_condensation, self.zeropower_econ_data)
-
-        if valid == 0:
-            valid = self.get_values(t_suction, t_condensation, self.zeropower_noecon_data)
-            self.economizer = 0
-        else:
-            self.economizer = 1
-        return valid
-
-    def calculate_frompower(self, frompower, t_suction, t_condensation):
-        """ Bevorzugte Funktion:
-            Liefert valid = get_values für alle Daten des Betriebspunkt frompower = prozentuale Leistung
-        """
-
-        id1 = int(frompower / 25.0)
-        valid1 = self.get_values(t_suction, t_condensation, self.frompower_econ_data[id1])
-        vec1 = self.actual_values
-        valid2 = self.get_values(t_suction, t_condensation, self.frompower_econ_data[min(id1 + 1, 4)])
-        vec2 = self.actual_values
-        self.economizer = 1
-
-        if valid1 == 0 or valid2 == 0:  # probiere ohne Economizer
-            valid1 = self.get_values(t_suction, t_condensation, self.frompower_noecon_data[id1])
-            vec1 = self.actual_values
-            valid2 = self.get_values(t_suction, t_condensation, self.frompower_noecon_data[min(id1 + 1, 4)])
-            vec2 = self.actual_values
-            self.economizer = 0
-
-        if valid1 == 1 and valid2 == 1:
-            ref = [0.0, 25.0, 50.0, 75.0, 100.0]
-            for i in range(0, 38, 1):  # linear interpolation achtung 1 niedriger da, CID schon geschnitten
-                vec1[i] = vec1[i] + (vec2[i] - vec1[i]) / 25.0 * (frompower - ref[id1])
-            self.actual_values = vec1
-            valid = 1
-        else:
-            valid = 0
-        return valid
+    __slots__ = ()
 
     def power_evaporator(self):
         return self.actual_values[17]
@@ -246,38 +321,177 @@ class TurboCor(Compressor):
         return self.actual_values[37]
 
 
-class TurboCor_noEcon(TurboCor):
+class TurboCorResult(TurboCorValues):
+    """ Unveränderliches Ergebnis eines TurboCor-Betriebspunkts (zustandslos, threadsicher).
+        valid und economizer wie bei calculate_zeropower, actual_values ist bei ungültigem Ergebnis NaN """
+
+    __slots__ = ("actual_values", "valid", "economizer")
+
+    def __init__(self, values=None, economizer: int = 0):
+        """ values: 38er-Vektor oder None für ein ungültiges Ergebnis """
+        valid = int(values is not None)
+        values = np.array(values, dtype=float) if valid else np.full(38, np.nan)
+        values.flags.writeable = False
+        object.__setattr__(self, "actual_values", values)
+        object.__setattr__(self, "valid", valid)
+        object.__setattr__(self, "economizer", economizer)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("TurboCorResult ist unveränderlich")
+
+    def __repr__(self):
+        return f"TurboCorResult(valid={self.valid}, economizer={self.economizer})"
+
+
+class TurboCorColumns(TurboCorValues):
+    """ Benannte Zugriffe auf die Spalten (38, N) eines Batch-Ergebnisses, z.B. calculate_frompower_batch(...)[0].T """
+
+    __slots__ = ("actual_values",)
+
+    def __init__(self, values):
+        self.actual_values = values
+
+
+class TurboCor(TurboCorValues, Compressor):
+    """ Klasse TurboCor Kompressor von Danfoss
+        Daten sind aus der SW von Danfoss abgeleitet. Das Original-Excel von Danfoss wurde modifiziert.
+        Die Verdamfungstemperatur, die Kondensationstemperatur und die Leistung wurden mit und ohne Economizer in Schritten varriert
+        und anschliessend in eine csv Datei geschrieben.
+        Die Klasse TurboCor liest diese Dateien und interpoliert linear - mit und ohne Economizer und liefert das bessere Ergebnis
+        self.economizer wird dann gesetzt.
+    """
+    # Reihenfolge der frompower-Tabellen in self.frompower_data: zuerst mit Economizer, sonst ohne
+    frompower_economizer = (1, 0)
+
     def __init__(self, fname: str):
-        super(TurboCor_noEcon, self).__init__(fname)
+        # optimal data w/o Economizer, Tabellen werden über read_table_csv zwischengespeichert
+        fcsv = DATA_DIRECTORY / (fname + '-noEcon_0Power.csv')
+        self.zeropower_noecon_data = read_table_csv(fcsv, 527, (17, 31, 39))
+
+        # die übrigen Tabellen lagen bisher im Arbeitsverzeichnis, d.h. neben diesem Modul
+        fcsv = MODULE_DIRECTORY / (fname + '-Econ_0Power.csv')
+        self.zeropower_econ_data = read_table_csv(fcsv, 527, (17, 31, 39))
+
+        fcsv = MODULE_DIRECTORY / (fname + '-noEcon_FromPower.csv')
+        self.frompower_noecon_data = read_table_csv(fcsv, 2635, (5, 17, 31, 39))
+
+        fcsv = MODULE_DIRECTORY / (fname + '-Econ_FromPower.csv')
+        self.frompower_econ_data = read_table_csv(fcsv, 2635, (5, 17, 31, 39))
+        self.frompower_data = self.stack_frompower()
+
+        valid = self.calculate_frompower(frompower=50.0, t_suction=0.0, t_condensation=37.5)
+        print("TurboCor Init: ", fname, "Minimum Power 50% 0 37.5 Grad: ", self.power_minimum(),
+              " Maximum Power: ", self.power_maximum())
+        self.economizer = 0
+
+    def calculate_0power_econ(self, t_suction, t_condensation):
+        vec0 = interpolate_table(self.zeropower_econ_data, t_suction, t_condensation)
+        if vec0 is None or vec0[10] == 0:
+            return 0
+        self.actual_values = vec0
+        return 1
+
+    def calculate_0power_noecon(self, t_suction, t_condensation):
+        return self.get_values(t_suction, t_condensation, self.zeropower_noecon_data)
 
     def calculate_0power(self, t_suction, t_condensation):
-        valid = self.calculate_0power_noecon(t_suction, t_condensation)
+        """ Liefert """
+        valid = self.calculate_0power_econ(t_suction, t_condensation)
+        if valid == 0:
+            valid = self.calculate_0power_noecon(t_suction, t_condensation)
         return valid  # Results in self.actual_values_0Power
 
+    def get_values(self, t_suction, t_condensation, rs):
+        """ Interpoliert alle 38 Werte aus der Tabelle rs nach self.actual_values, liefert valid (0/1) """
+        vec0 = interpolate_table(rs, t_suction, t_condensation)
+        if vec0 is None:
+            return 0
+        self.actual_values = vec0
+        return 1
+
     def calculate_zeropower(self, t_suction, t_condensation):
 
-        valid = self.get_values(t_suction, t_condensation, self.zeropower_noecon_data)
-        self.economizer = 0
-        return valid
+        """ Bevorzugte Funktion:
+            Liefert valid = get_values für alle Daten des Betriebspunkt zeropower = optimale Effizienz
+            Ergebnis in self.actual_values, zustandslos siehe zeropower
+        """
+        return self._store(self.zeropower(t_suction, t_condensation))
 
     def calculate_frompower(self, frompower, t_suction, t_condensation):
+        """ Bevorzugte Funktion:
+            Liefert valid = get_values für alle Daten des Betriebspunkt frompower = prozentuale Leistung
+            Ergebnis in self.actual_values, zustandslos siehe frompower
+        """
+        return self._store(self.frompower(frompower, t_suction, t_condensation))
+
+    def _store(self, result: TurboCorResult) -> int:
+        """ Übernimmt ein Ergebnis in self.actual_values / self.economizer (alte API) """
+        if result.valid:
+            self.actual_values = result.actual_values
+        self.economizer = result.economizer
+        return result.valid
+
+    def zeropower(self, t_suction, t_condensation) -> TurboCorResult:
+        """ Betriebspunkt zeropower = optimale Effizienz, mit Economizer wenn möglich.
+            Zustandslos: self wird nicht verändert, eine Instanz kann von mehreren Threads genutzt werden """
+        values = interpolate_table(self.zeropower_econ_data, t_suction, t_condensation)
+        if values is not None:
+            return TurboCorResult(values, 1)
+        return TurboCorResult(interpolate_table(self.zeropower_noecon_data, t_suction, t_condensation), 0)
+
+    def stack_frompower(self):
+        """ frompower-Tabellen in der Reihenfolge frompower_economizer als ndarray-Sichten ohne Kopie der
+            (memory-mapped) Tabellen """
+        tables = (self.frompower_noecon_data, self.frompower_econ_data)
+        return tuple(np.asarray(tables[economizer]) for economizer in self.frompower_economizer)
+
+    def frompower(self, frompower, t_suction, t_condensation) -> TurboCorResult:
+        """ Betriebspunkt frompower = prozentuale Leistung, mit Economizer wenn möglich. Zustandslos wie zeropower """
+        result = interpolate_frompower(self.frompower_data, frompower, t_suction, t_condensation)
+        if result is None:
+            return TurboCorResult(None, 0)
+        return TurboCorResult(result[0], self.frompower_economizer[result[1]])
+
+    def evaluate(self, frompower, t_suction, t_condensation) -> 'CompressorOutput':
+        """ CompressorBackend: calculate_frompower_batch als CompressorOutput (Heizleistung = Kondensator),
+            die Stromaufnahme ist in den Tabellen nicht enthalten (NaN) """
+        CompressorOutput = _project_module('..EM_Compressor').CompressorOutput
+        values, valid, _ = self.calculate_frompower_batch(frompower, t_suction, t_condensation)
+        columns = TurboCorColumns(values.T)
+        return CompressorOutput(columns.power_condenser(), columns.power_electrical(), columns.massflow_evaporator(),
+                                np.full(valid.shape, np.nan), columns.power_evaporator(), columns.cop(),
+                                columns.temperature_discharge(), valid)
+
+    def calculate_zeropower_batch(self, t_suction, t_condensation):
+        """ Vektorisierte Variante von calculate_zeropower, self.actual_values bleibt unverändert.
+            Ergebnis: (values (N, 38), valid (N,), economizer (N,)), ungültige Zeilen sind NaN """
+        values, economizer = interpolate_table_batch(self.zeropower_econ_data, t_suction, t_condensation)
+        noecon, valid = interpolate_table_batch(self.zeropower_noecon_data, t_suction, t_condensation)
+        values[~economizer] = noecon[~economizer]
+        return values, economizer | valid, economizer
+
+    def calculate_frompower_batch(self, frompower, t_suction, t_condensation):
+        """ Vektorisierte Variante von calculate_frompower, Ergebnis wie calculate_zeropower_batch """
+        values, valid, table = interpolate_frompower_batch(self.frompower_data, frompower, t_suction, t_condensation)
+        return values, valid, valid & np.asarray(self.frompower_economizer, dtype=bool)[table]
 
-        id1 = int(frompower / 25.0)
-        valid1 = self.get_values(t_suction, t_condensation, self.frompower_noecon_data[id1])
-        vec1 = self.actual_values
-        valid2 = self.get_values(t_suction, t_condensation, self.frompower_noecon_data[min(id1 + 1, 4)])
-        vec2 = self.actual_values
-        self.economizer = 0
 
-        if valid1 == 1 and valid2 == 1:
-            ref = [0.0, 25.0, 50.0, 75.0, 100.0]
-            for i in range(0, 38, 1):  # linear interpolation achtung 1 niedriger da, CID schon geschnitten
-                vec1[i] = vec1[i] + (vec2[i] - vec1[i]) / 25.0 * (frompower - ref[id1])
-            self.actual_values = vec1
-            valid = 1
-        else:
-            valid = 0
-        return valid
+class TurboCor_noEcon(TurboCor):
+    frompower_economizer = (0,)
+
+    def __init__(self, fname: str):
+        super(TurboCor_noEcon, self).__init__(fname)
+
+    def calculate_0power(self, t_suction, t_condensation):
+        valid = self.calculate_0power_noecon(t_suction, t_condensation)
+        return valid  # Results in self.actual_values_0Power
+
+    def zeropower(self, t_suction, t_condensation) -> TurboCorResult:
+        return TurboCorResult(interpolate_table(self.zeropower_noecon_data, t_suction, t_condensation), 0)
+
+    def calculate_zeropower_batch(self, t_suction, t_condensation):
+        values, valid = interpolate_table_batch(self.zeropower_noecon_data, t_suction, t_condensation)
+        return values, valid, np.zeros(valid.shape, dtype=bool)
 
 
 class PolyScroll(Compressor):
@@ -287,9 +501,8 @@ class PolyScroll(Compressor):
         self.rpm = rpm
 
         # Compressor data from Polynoms with speeds
-        project_root = os.path.dirname(os.path.abspath(__file__))
-
-        fcsv = Path(project_root, "../Datenfiles", fname)
+        fcsv = DATA_DIRECTORY / fname
+        import pandas as pd
         pddata = pd.read_csv(fcsv, sep=';',encoding= 'unicode_escape')
         linedat = pddata.to_numpy(copy=True)
         self.poly_data = linedat
@@ -474,59 +687,40 @@ class PolyScroll(Compressor):
 
         return np.array((qheat, epower, massflow, ecurrent, capacity, cop, Tdischarge, invpower))
 
+    @cached_property
+    def rpm_coefficients(self) -> np.ndarray:
+        """ Koeffizienten der 10-Term-Polynome aller Drehzahlen als (10, 4 * len(rpm))-Matrix,
+            je Drehzahl die Spalten Heizleistung, Leistung, Massenstrom, Strom """
+        columns = [7 * isp + 1 + j for isp in range(len(self.rpm)) for j in range(4)]
+        return self.poly_data[0:10, columns].astype(float)
+
     def calculate_fromrpm(self, speed, t_suction, t_condensation):
-        """ Eingabe: Drehzahl, Verdampfungstemperatur, Kondensationstemperatur
+        """ Eingabe: Drehzahl, Verdampfungstemperatur, Kondensationstemperatur (Skalare oder Arrays)
             Ergebnis: nparray: Heizleistung, Kompressorleistung, Massenstrom, Stromaufnahme, Verdampferleistung, COP
-            Verwendet griddata für die Interpolation"""
-        data = self.poly_data
-        ishift = 7
-        rpm = self.rpm
-        capacity = np.empty(4, float)  # nur fuer die Dimension der Liste
-        power = np.empty(4, float)  # nur fuer die Dimension der Liste
-        flow_rate = np.empty(4, float)  # nur fuer die Dimension der Liste
-        current = np.empty(4, float)  # nur fuer die Dimension der Liste
-
-        for isp in range(0, len(self.rpm)):
-            ic = ishift * isp + 1
-            capacity[isp] = (data[0, ic] + t_suction * data[1, ic] + t_condensation * data[2, ic] +
-                             t_suction ** 2 * data[3, ic] + t_suction * t_condensation * data[4, ic] +
-                             t_condensation ** 2 * data[5, ic] + t_suction ** 3 *
-                             data[6, ic] + t_suction ** 2 * t_condensation * data[7, ic] +
-                             t_suction * t_condensation ** 2 * data[8, ic] +
-                             t_condensation ** 3 * data[9, ic])
-            ic += 1
-            power[isp] = (data[0, ic] + t_suction * data[1, ic] + t_condensation * data[2, ic] +
-                          t_suction ** 2 * data[3, ic] + t_suction * t_condensation * data[4, ic] +
-                          t_condensation ** 2 * data[5, ic] + t_suction ** 3 *
-                          data[6, ic] + t_suction ** 2 * t_condensation * data[7, ic] +
-                          t_suction * t_condensation ** 2 * data[8, ic] +
-                          t_condensation ** 3 * data[9, ic])
-
-            ic += 1
-            flow_rate[isp] = (data[0, ic] + t_suction * data[1, ic] + t_condensation * data[2, ic] +
-                              t_suction ** 2 * data[3, ic] + t_suction * t_condensation * data[4, ic] +
-                              t_condensation ** 2 * data[5, ic] + t_suction ** 3 *
-                              data[6, ic] + t_suction ** 2 * t_condensation * data[7, ic] +
-                              t_suction * t_condensation ** 2 * data[8, ic] +
-                              t_condensation ** 3 * data[9, ic])
-
-            ic += 1
-            current[isp] = (data[0, ic] + t_suction * data[1, ic] + t_condensation * data[2, ic] +
-                            t_suction ** 2 * data[3, ic] + t_suction * t_condensation * data[4, ic] +
-                            t_condensation ** 2 * data[5, ic] + t_suction ** 3 *
-                            data[6, ic] + t_suction ** 2 * t_condensation * data[7, ic] +
-                            t_suction * t_condensation ** 2 * data[8, ic] +
-                            t_condensation ** 3 * data[9, ic])
-
-        cap = griddata(np.array(self.rpm), capacity, speed, method='linear')
-        pow = griddata(np.array(self.rpm), power, speed, method='linear')
-        flow = griddata(np.array(self.rpm), flow_rate, speed, method='linear')
-        cur = griddata(np.array(self.rpm), current, speed, method='linear')
+            Alle Drehzahlkurven werden mit einem Matrixprodukt ausgewertet und linear über die (aufsteigenden)
+            Drehzahlen self.rpm interpoliert, außerhalb der Drehzahlen NaN"""
+        speed, t_suction, t_condensation = np.broadcast_arrays(
+            *(np.asarray(a, dtype=float) for a in (speed, t_suction, t_condensation)))
+        curves = poly10_basis(t_suction, t_condensation) @ self.rpm_coefficients
+        # lineare Gewichte der Drehzahlen (Hutfunktionen über np.interp), außerhalb NaN
+        weights = np.stack([np.interp(speed, self.rpm, node, left=np.nan, right=np.nan)
+                            for node in np.eye(len(self.rpm))], axis=-1)
+        values = weights[..., np.newaxis, :] @ curves.reshape(speed.shape + (len(self.rpm), 4))
+
+        cap, pow, flow, cur = np.moveaxis(values[..., 0, :], -1, 0)
         coolcap = cap - pow
         cop = cap / pow
 
         return np.array((cap, pow, flow, cur, coolcap, cop))
 
+    def evaluate(self, speed, t_suction, t_condensation) -> 'CompressorOutput':
+        """ CompressorBackend: calculate_fromrpm als CompressorOutput, gültig innerhalb der Drehzahlen self.rpm,
+            die Heissgastemperatur ist in den Polynomen nicht enthalten (NaN) """
+        CompressorOutput = _project_module('..EM_Compressor').CompressorOutput
+        cap, pow, flow, cur, coolcap, cop = (np.ravel(v) for v in
+                                             self.calculate_fromrpm(speed, t_suction, t_condensation))
+        return CompressorOutput(cap, pow, flow, cur, coolcap, cop, np.full(cap.shape, np.nan), np.isfinite(cap))
+
     def h2(self, Pel, h1, mdot_refC, minj, hinj):
         # Get Hotgas Enthalpy
 
@@ -546,32 +740,47 @@ class PolyScroll(Compressor):
         return h2_ges
 
 class corrSH_PolyScroll(PolyScroll):
-    def __init__(self, fname, rpm):
+    """ PolyScroll mit Überhitzungskorrektur. properties: Stoffwert-Backend (Standard: CoolPropBackend,
+        schneller: RefrigerantTables.TabulatedBackend) """
+
+    def __init__(self, fname, rpm, properties=None):
             super().__init__(fname, rpm)
+            if properties is None:
+                properties = _project_module('.RefrigerantTables').CoolPropBackend('R290')
+            self.properties = properties
+
+    def evaluate(self, speed, t_suction, t_condensation) -> 'CompressorOutput':
+        """ CompressorBackend: calculate_direct (30-Term-Polynome) als CompressorOutput,
+            gültig innerhalb der Drehzahlen self.rpm """
+        CompressorOutput = _project_module('..EM_Compressor').CompressorOutput
+        speed, t_suction, t_condensation = np.broadcast_arrays(
+            *(np.asarray(a, dtype=float) for a in (speed, t_suction, t_condensation)))
+        return CompressorOutput.from_direct(self.calculate_direct(speed, t_suction, t_condensation),
+                                            (speed >= min(self.rpm)) & (speed <= max(self.rpm)))
 
     def getsuperheatedRefstate1(self, T_evap, superheat):
-        p_evap = PropsSI('P', 'T', 273 + T_evap, 'Q', 0.5, 'R290')
-        h1_map = PropsSI('H', 'T', 273 + T_evap + superheat, 'P', p_evap, 'R290')
-        d1_map = PropsSI('D', 'T', 273 + T_evap + superheat, 'P', p_evap, 'R290')
-        s1_map = PropsSI('S', 'T', 273 + T_evap + superheat, 'P', p_evap, 'R290')
+        p_evap = self.properties.p_sat(273 + T_evap)
+        h1_map = self.properties.h_pt(p_evap, 273 + T_evap + superheat)
+        d1_map = self.properties.d_pt(p_evap, 273 + T_evap + superheat)
+        s1_map = self.properties.s_pt(p_evap, 273 + T_evap + superheat)
         return np.array((T_evap + superheat, p_evap, h1_map, d1_map, s1_map))
 
     def getIsentropicCompState(self, T_cond, s1):
-        p_cond = PropsSI('P', 'T', 273 + T_cond, 'Q', 0.5, 'R290')
-        h2S = PropsSI('H', 'P', p_cond, 'S', s1, 'R290')
+        p_cond = self.properties.p_sat(273 + T_cond)
+        h2S = self.properties.h_ps(p_cond, s1)
         return np.array((h2S, p_cond))
 
     def getRealCompState(self, speed, T_evap, T_cond, p_cond):
         comp_map = self.calculate_direct(speed, T_evap, T_cond)
-        h2_map = PropsSI('H', 'T', comp_map[6] + 273, 'P', p_cond, 'R290')
-        d2_map = PropsSI('D', 'T', comp_map[6] + 273, 'P', p_cond, 'R290')
+        h2_map = self.properties.h_pt(p_cond, comp_map[6] + 273)
+        d2_map = self.properties.d_pt(p_cond, comp_map[6] + 273)
         return np.append(np.array((h2_map, d2_map,)), comp_map)
 
     def getIsentropicEfficiency(self, h2, h2s, h1):
         return ((h2s - h1) / (h2 - h1))
 
     def getCondensingPower(self, p_cond, h2):
-        h3 = PropsSI('H', 'P', p_cond, 'Q', 0, 'R290')
+        h3 = self.properties.h_liquid(p_cond)
         return (h2 - h3)
 
     def getNewState2(self, speed, T_evap, T_cond, superheat):
@@ -582,13 +791,39 @@ class corrSH_PolyScroll(PolyScroll):
         refstate_1 = self.getsuperheatedRefstate1(T_evap, superheat)
         hp2s_new = self.getIsentropicCompState(T_cond, refstate_1[4])
         h2 = refstate_1[2] + (hp2s_new[0] - refstate_1[2]) / n_is
-        Tdc_new = PropsSI('T', 'H', h2, 'P', hp2s_new[1], 'R290') - 273
-        d2 = PropsSI('D', 'T', 273 + Tdc_new, 'P', hp2s_new[1], 'R290')
+        Tdc_new = self.properties.t_ph(hp2s_new[1], h2) - 273
+        d2 = self.properties.d_pt(hp2s_new[1], 273 + Tdc_new)
         mdot_new = compstate_map[4] * refstate_1[3] / refstate_1D[3]
         Qdot = self.getCondensingPower(hp2S_map[1], h2) * mdot_new
         return np.array((compstate_map[2], compstate_map[3], mdot_new, compstate_map[5], compstate_map[6],
                              compstate_map[7], Tdc_new, compstate_map[8]))
 
+    def getNewState2_batch(self, speed, T_evap, T_cond, superheat):
+        """ Wie getNewState2 für Arrays (Broadcasting), Ergebnis (N, 8) in derselben Reihenfolge.
+            Referenzzustand (10 K Überhitzung) und Kondensationsdruck werden je eindeutiger Temperatur
+            nur einmal berechnet """
+        speed, T_evap, T_cond, superheat = (np.ravel(a).astype(float) for a in
+                                            np.broadcast_arrays(speed, T_evap, T_cond, superheat))
+        props = self.properties
+
+        T_evap_unique, i_evap = np.unique(T_evap, return_inverse=True)
+        refstate_1D = self.getsuperheatedRefstate1(T_evap_unique, 10)[:, i_evap]
+        T_cond_unique, i_cond = np.unique(T_cond, return_inverse=True)
+        p_cond = props.p_sat(273 + T_cond_unique)[i_cond]
+
+        comp_map = np.asarray(self.calculate_direct(speed, T_evap, T_cond), dtype=float)
+        h2S_map = props.h_ps(p_cond, refstate_1D[4])
+        h2_map = props.h_pt(p_cond, comp_map[6] + 273)
+        n_is = self.getIsentropicEfficiency(h2_map, h2S_map, refstate_1D[2])
+
+        refstate_1 = self.getsuperheatedRefstate1(T_evap, superheat)
+        h2s_new = props.h_ps(p_cond, refstate_1[4])
+        h2 = refstate_1[2] + (h2s_new - refstate_1[2]) / n_is
+        Tdc_new = props.t_ph(p_cond, h2) - 273
+        mdot_new = comp_map[2] * refstate_1[3] / refstate_1D[3]
+        return np.column_stack((comp_map[0], comp_map[1], mdot_new, comp_map[3], comp_map[4], comp_map[5],
+                                Tdc_new, comp_map[6]))
+
 
 class fix_PolyScroll(PolyScroll):
     """ Fixed speed Scroll Verdichter mit Polynom"""
@@ -597,64 +832,38 @@ class fix_PolyScroll(PolyScroll):
         self.rpm = rpm
 
         # Compressor data from Polynoms with speeds
-        fcsv = Path("../Datenfiles", fname)
+        fcsv = DATA_DIRECTORY / fname
+        import pandas as pd
         pddata = pd.read_csv(fcsv, sep=';')
         linedat = pddata.to_numpy(copy=True)
         self.poly_data = linedat
 
+    @cached_property
+    def coefficients(self) -> np.ndarray:
+        """ Koeffizienten der 10-Term-Polynome als (10, 5)-Matrix, Spalten Heizleistung, Leistung, Massenstrom,
+            Strom, Heissgastemperatur """
+        return self.poly_data[0:10, 1:6].astype(float)
+
     def calculate_fromrpm(self, speed, t_suction, t_condensation):
-        """ Eingabe: Drehzahl (dummy), Verdampfungstemperatur, Kondensationstemperatur
+        """ Eingabe: Drehzahl (dummy), Verdampfungstemperatur, Kondensationstemperatur (Skalare oder Arrays)
              Ergebnis: nparray: Heizleistung, Kompressorleistung, Massenstrom, Stromaufnahme, Verdampferleistung, COP, Heissgastemperatur (sofern vorhanden)
+             Alle fünf Polynome werden mit einem Matrixprodukt ausgewertet
             """
-
-        data = self.poly_data
-        ishift = 0
-        rpm = self.rpm
-        capacity = np.empty(4, float)  # nur fuer die Dimension der Liste
-        power = np.empty(4, float)  # nur fuer die Dimension der Liste
-        flow_rate = np.empty(4, float)  # nur fuer die Dimension der Liste
-        current = np.empty(4, float)  # nur fuer die Dimension der Liste
-
-        cap = (data[0, 1] + t_suction * data[1, 1] + t_condensation * data[2, 1] +
-               t_suction ** 2 * data[3, 1] + t_suction * t_condensation * data[4, 1] +
-               t_condensation ** 2 * data[5, 1] + t_suction ** 3 *
-               data[6, 1] + t_suction ** 2 * t_condensation * data[7, 1] +
-               t_suction * t_condensation ** 2 * data[8, 1] +
-               t_condensation ** 3 * data[9, 1])
-
-        power = (data[0, 2] + t_suction * data[1, 2] + t_condensation * data[2, 2] +
-                 t_suction ** 2 * data[3, 2] + t_suction * t_condensation * data[4, 2] +
-                 t_condensation ** 2 * data[5, 2] + t_suction ** 3 *
-                 data[6, 2] + t_suction ** 2 * t_condensation * data[7, 2] +
-                 t_suction * t_condensation ** 2 * data[8, 2] +
-                 t_condensation ** 3 * data[9, 2])
-
-        flow = (data[0, 3] + t_suction * data[1, 3] + t_condensation * data[2, 3] +
-                t_suction ** 2 * data[3, 3] + t_suction * t_condensation * data[4, 3] +
-                t_condensation ** 2 * data[5, 3] + t_suction ** 3 *
-                data[6, 3] + t_suction ** 2 * t_condensation * data[7, 3] +
-                t_suction * t_condensation ** 2 * data[8, 3] +
-                t_condensation ** 3 * data[9, 3])
-
-        cur = (data[0, 4] + t_suction * data[1, 4] + t_condensation * data[2, 4] +
-               t_suction ** 2 * data[3, 4] + t_suction * t_condensation * data[4, 4] +
-               t_condensation ** 2 * data[5, 4] + t_suction ** 3 *
-               data[6, 4] + t_suction ** 2 * t_condensation * data[7, 4] +
-               t_suction * t_condensation ** 2 * data[8, 4] +
-               t_condensation ** 3 * data[9, 4])
-
-        tdis = (data[0, 5] + t_suction * data[1, 5] + t_condensation * data[2, 5] +
-                t_suction ** 2 * data[3, 5] + t_suction * t_condensation * data[4, 5] +
-                t_condensation ** 2 * data[5, 5] + t_suction ** 3 *
-                data[6, 5] + t_suction ** 2 * t_condensation * data[7, 5] +
-                t_suction * t_condensation ** 2 * data[8, 5] +
-                t_condensation ** 3 * data[9, 5])
+        cap, power, flow, cur, tdis = np.moveaxis(poly10_basis(t_suction, t_condensation) @ self.coefficients, -1, 0)
 
         coolcap = cap - power
         cop = cap / power
 
         return np.array((cap, power, flow, cur, coolcap, cop, tdis))
 
+    def evaluate(self, speed, t_suction, t_condensation) -> 'CompressorOutput':
+        """ CompressorBackend: calculate_fromrpm als CompressorOutput, die Drehzahl ist fest (dummy) """
+        CompressorOutput = _project_module('..EM_Compressor').CompressorOutput
+        speed, t_suction, t_condensation = np.broadcast_arrays(speed, t_suction, t_condensation)
+        cap, power, flow, cur, coolcap, cop, tdis = (np.ravel(v) for v in
+                                                     self.calculate_fromrpm(speed, t_suction, t_condensation))
+        return CompressorOutput(cap, power, flow, cur, coolcap, cop, tdis, np.isfinite(cap))
+
 
 if __name__ == '__main__':
 
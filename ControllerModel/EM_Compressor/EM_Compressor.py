@@ -1,34 +1,906 @@
+import hashlib
+import importlib
 import json
-from typing import List, Tuple
+import struct
+import zlib
+from collections import OrderedDict
+from typing import Callable, List, NamedTuple, Protocol, Tuple
 import numpy as np
 from pathlib import Path
 
 # Definition eines Punktes als Tuple (x, y)
 Point = Tuple[float, float]
 
+# Zeilen der Koeffizientenmatrix (5, 30) in der Reihenfolge von poly_data
+POLY_COMPONENTS = ("capacity", "epower", "ecurrent", "massflow", "Tdischarge")
 
-class Compressor:
+# Linearkombination der Polynomzeilen zu den Ausgängen von calculate_direct:
+# qheat, epower, massflow, ecurrent, capacity, cop (nichtlinear, Zeile bleibt 0), Tdischarge, invpower.
+# comppower verwendet dieselben Koeffizienten (Offset 30) wie epower, daher ist invpower identisch 0.
+_OUTPUT_COMBINATION = np.array([
+    [1.0, 1.0, 0.0, 0.0, 0.0],  # qheat = capacity + comppower
+    [0.0, 1.0, 0.0, 0.0, 0.0],  # epower
+    [0.0, 0.0, 0.0, 1.0, 0.0],  # massflow
+    [0.0, 0.0, 1.0, 0.0, 0.0],  # ecurrent
+    [1.0, 0.0, 0.0, 0.0, 0.0],  # capacity
+    [0.0, 0.0, 0.0, 0.0, 0.0],  # cop = qheat / epower
+    [0.0, 0.0, 0.0, 0.0, 1.0],  # Tdischarge
+    [0.0, 0.0, 0.0, 0.0, 0.0],  # invpower = epower - comppower
+])
+
+# Potenz der Drehzahl in jedem der 30 Monome (siehe _monomial_terms)
+_SPEED_POWER = np.array([0, 0, 0, 0, 0, 2, 2, 2, 1, 1, 1, 0, 0, 0, 0, 0,
+                         1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2])
+
+
+def _monomial_terms(n, s, t):
+    """ Die 30 Monome des Verdichterpolynoms in der Reihenfolge der Koeffizienten. """
+    n2 = n * n
+    s2 = s * s
+    t2 = t * t
+    s3 = s2 * s
+    t3 = t2 * t
+    st = s * t
+    return (1.0, s, t, s2, t2,
+            st * n2, st * s * n2, st * t * n2,
+            st * n, st * s * n, st * t * n,
+            st, st * s, st * t,
+            s3, t3,
+            n, n * s, n * t, n * s2, n * t2, n * s3, n * t3,
+            n2, n2 * s, n2 * t, n2 * s2, n2 * t2, n2 * s3, n2 * t3)
+
+
+def monomial_basis(speed, t_suction, t_condensation) -> np.ndarray:
     """
-    Objektorientiertes Equipment-Modul für einen Verdichter.
-    Liess Polynom-Koeffizienten und Betriebsgrenzen aus einer JSON-Datei.
+    Baut den Monom-Basisvektor des 30-Term-Polynoms.
+    Skalare liefern ein (30,)-Array, Arrays werden gebroadcastet und liefern (..., 30).
+    Jede Polynomzeile ergibt sich dann als basis @ coefficients[k].
     """
+    terms = _monomial_terms(speed, t_suction, t_condensation)
+    if np.ndim(speed) == 0 and np.ndim(t_suction) == 0 and np.ndim(t_condensation) == 0:
+        return np.array(terms, dtype=float)
+    return np.stack(np.broadcast_arrays(*[np.asarray(x, dtype=float) for x in terms]), axis=-1)
+
+
+def _monomial_derivatives(n, s, t):
+    """ Partielle Ableitungen der 30 Monome nach Drehzahl, Verdampfungs- und Kondensationstemperatur. """
+    n2 = n * n
+    s2 = s * s
+    t2 = t * t
+    s3 = s2 * s
+    t3 = t2 * t
+    st = s * t
+    d_n = (0.0, 0.0, 0.0, 0.0, 0.0,
+           2.0 * st * n, 2.0 * st * s * n, 2.0 * st * t * n,
+           st, st * s, st * t,
+           0.0, 0.0, 0.0,
+           0.0, 0.0,
+           1.0, s, t, s2, t2, s3, t3,
+           2.0 * n, 2.0 * n * s, 2.0 * n * t, 2.0 * n * s2, 2.0 * n * t2, 2.0 * n * s3, 2.0 * n * t3)
+    d_s = (0.0, 1.0, 0.0, 2.0 * s, 0.0,
+           t * n2, 2.0 * st * n2, t2 * n2,
+           t * n, 2.0 * st * n, t2 * n,
+           t, 2.0 * st, t2,
+           3.0 * s2, 0.0,
+           0.0, n, 0.0, 2.0 * n * s, 0.0, 3.0 * n * s2, 0.0,
+           0.0, n2, 0.0, 2.0 * n2 * s, 0.0, 3.0 * n2 * s2, 0.0)
+    d_t = (0.0, 0.0, 1.0, 0.0, 2.0 * t,
+           s * n2, s2 * n2, 2.0 * st * n2,
+           s * n, s2 * n, 2.0 * st * n,
+           s, s2, 2.0 * st,
+           0.0, 3.0 * t2,
+           0.0, 0.0, n, 0.0, 2.0 * n * t, 0.0, 3.0 * n * t2,
+           0.0, 0.0, n2, 0.0, 2.0 * n2 * t, 0.0, 3.0 * n2 * t2)
+    return d_n, d_s, d_t
+
+
+def monomial_basis_derivatives(speed, t_suction, t_condensation) -> np.ndarray:
+    """
+    Ableitungen des Monom-Basisvektors; Arrays werden gebroadcastet und liefern (..., 3, 30)
+    mit den Zeilen d/d(speed), d/d(t_suction), d/d(t_condensation).
+    """
+    derivatives = _monomial_derivatives(speed, t_suction, t_condensation)
+    shape = np.broadcast_shapes(np.shape(speed), np.shape(t_suction), np.shape(t_condensation))
+    return np.stack([np.stack([np.broadcast_to(np.asarray(x, dtype=float), shape) for x in d], axis=-1)
+                     for d in derivatives], axis=-2)
+
 
-    def __init__(self, json_file_path, high_value_temporary_out_of_field: int = 300):
+def _locate_polygons(polygons, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    Vektorisiertes Ray-Casting mit denselben Vergleichen wie Compressor.check_polygon.
+    Liefert je Punkt den Index des ersten Polygons, das den Punkt enthält, sonst -1.
+    """
+    found = np.full(x.shape, -1, dtype=np.intp)
+    for i, polygon in enumerate(polygons):
+        vertices = np.asarray(polygon, dtype=float)
+        inside = np.zeros(x.shape, dtype=bool)
+        k = len(vertices) - 1
+        for j in range(len(vertices)):
+            x1, y1 = vertices[j]
+            x2, y2 = vertices[k]
+            crosses = (y1 > y) != (y2 > y)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                inside ^= crosses & (x < (x2 - x1) * (y - y1) / (y2 - y1) + x1)
+            k = j
+        found[(found < 0) & inside] = i
+    return found
+
+
+def _point_in_polygon(x: float, y: float, polygon) -> bool:
+    """ Ray-Casting für ein Polygon mit denselben Vergleichen wie Compressor.check_polygon_exact. """
+    inside = False
+    x2, y2 = polygon[-1]
+    for x1, y1 in polygon:
+        if ((y1 > y) != (y2 > y)) and (x < (x2 - x1) * (y - y1) / (y2 - y1) + x1):
+            inside = not inside
+        x2, y2 = x1, y1
+    return inside
+
+
+class EnvelopeIndex:
+    """
+    Rasterisierter Index der Betriebsgrenzen auf einem feinen (Tevap, Tcond)-Gitter.
+    Jede Zelle speichert das erste Polygon, das sie vollständig enthält (-1 = außerhalb).
+    Zellen, die eine Polygonkante berühren, sind als EDGE markiert und werden exakt geprüft,
+    und zwar nur gegen die Polygone, deren Kanten die Zelle berühren (siehe locate).
+    """
+
+    OUTSIDE = -1
+    EDGE = -2
+
+    def __init__(self, polygons, resolution: float = 0.25):
+        vertices = np.concatenate([np.asarray(polygon, dtype=float) for polygon in polygons])
+        self.resolution = resolution
+        # eine Zelle Rand, damit alles außerhalb des Gitters sicher außerhalb aller Polygone liegt
+        self.x0 = float(vertices[:, 0].min()) - resolution
+        self.y0 = float(vertices[:, 1].min()) - resolution
+        self.nx = int(np.ceil((vertices[:, 0].max() - self.x0) / resolution)) + 2
+        self.ny = int(np.ceil((vertices[:, 1].max() - self.y0) / resolution)) + 2
+
+        # Zellmittelpunkte klassifizieren, danach Kantenzellen überschreiben
+        xc = self.x0 + (np.arange(self.nx) + 0.5) * resolution
+        yc = self.y0 + (np.arange(self.ny) + 0.5) * resolution
+        xg, yg = np.meshgrid(xc, yc, indexing='ij')
+        cells = _locate_polygons(polygons, xg, yg)
+        for polygon in polygons:
+            self._mark_edges(cells, np.asarray(polygon, dtype=float))
+        self.cells = cells.astype(np.int8)
+        self._rows = memoryview(self.cells)  # für skalare Abfragen ohne NumPy-Overhead, ohne Kopie
+        self._candidates = {}
+
+    @classmethod
+    def from_cells(cls, cells: np.ndarray, x0: float, y0: float, resolution: float) -> 'EnvelopeIndex':
+        """ Übernimmt ein bereits berechnetes Raster, z.B. aus der Binärdatei des Kennfelds. """
+        index = cls.__new__(cls)
+        index.resolution = resolution
+        index.x0 = x0
+        index.y0 = y0
+        index.nx, index.ny = cells.shape
+        index.cells = cells
+        index._rows = memoryview(np.ascontiguousarray(cells))
+        index._candidates = {}
+        return index
+
+    def _edge_cells(self, vertices: np.ndarray, i_range=None, j_range=None):
         """
-        Initialisiert das Objekt durch Laden der Daten aus der JSON-Datei
-        und Initialisieren der Zähler.
+        Alle Zellen, die eine Kante des Polygons (inkl. kleiner Toleranz) schneidet, je Kante als
+        (i_lo, j_lo, touched); optional nur im Zellbereich i_range x j_range.
+        """
+        h = self.resolution
+        eps = 1e-9 * max(1.0, h)
+        i_min, i_max = i_range if i_range is not None else (0, self.nx - 1)
+        j_min, j_max = j_range if j_range is not None else (0, self.ny - 1)
+        k = len(vertices) - 1
+        for j in range(len(vertices)):
+            (x1, y1), (x2, y2) = vertices[j], vertices[k]
+            k = j
+            i_lo = max(int(np.floor((min(x1, x2) - eps - self.x0) / h)), i_min)
+            i_hi = min(int(np.floor((max(x1, x2) + eps - self.x0) / h)), i_max)
+            j_lo = max(int(np.floor((min(y1, y2) - eps - self.y0) / h)), j_min)
+            j_hi = min(int(np.floor((max(y1, y2) + eps - self.y0) / h)), j_max)
+            if i_lo > i_hi or j_lo > j_hi:
+                continue
+            cx = self.x0 + np.arange(i_lo, i_hi + 2) * h  # Zellecken
+            cy = self.y0 + np.arange(j_lo, j_hi + 2) * h
+            # Vorzeichen der Geradengleichung an den Zellecken (Trennachse = Kantennormale)
+            side = (x2 - x1) * (cy[None, :] - y1) - (y2 - y1) * (cx[:, None] - x1)
+            tol = eps * (abs(x2 - x1) + abs(y2 - y1) + 1.0)
+            pos = side > tol
+            neg = side < -tol
+            corners_pos = pos[:-1, :-1] & pos[1:, :-1] & pos[:-1, 1:] & pos[1:, 1:]
+            corners_neg = neg[:-1, :-1] & neg[1:, :-1] & neg[:-1, 1:] & neg[1:, 1:]
+            yield i_lo, j_lo, ~(corners_pos | corners_neg)
+
+    def _mark_edges(self, cells: np.ndarray, vertices: np.ndarray):
+        """ Markiert alle Zellen, die eine Kante des Polygons (inkl. kleiner Toleranz) schneidet. """
+        for i_lo, j_lo, touched in self._edge_cells(vertices):
+            cells[i_lo:i_lo + touched.shape[0], j_lo:j_lo + touched.shape[1]][touched] = self.EDGE
+
+    def _cell_candidates(self, ix: int, iy: int, polygons) -> tuple:
+        """
+        Polygone, die für eine Kantenzelle in Frage kommen, in Polygonreihenfolge als (Index, exakt prüfen).
+        Berührt keine Kante eines Polygons die Zelle, entscheidet die Zellmitte; die Liste endet
+        mit dem ersten Polygon, das die Zelle vollständig enthält.
+        """
+        xc = self.x0 + (ix + 0.5) * self.resolution
+        yc = self.y0 + (iy + 0.5) * self.resolution
+        candidates = []
+        for i, polygon in enumerate(polygons):
+            if any(touched.any() for _, _, touched in
+                   self._edge_cells(np.asarray(polygon, dtype=float), (ix, ix), (iy, iy))):
+                candidates.append((i, True))
+            elif _point_in_polygon(xc, yc, polygon):
+                candidates.append((i, False))
+                break
+        return tuple(candidates)
+
+    def locate(self, x: float, y: float, polygons) -> int:
+        """
+        Index des ersten Polygons, das den Punkt enthält, sonst OUTSIDE; Ergebnis wie check_polygon_exact.
+        Kantenzellen prüfen nur ihre Kandidaten (beim ersten Treffer der Zelle ermittelt und gespeichert).
+        """
+        fx = (x - self.x0) / self.resolution
+        fy = (y - self.y0) / self.resolution
+        if not (0.0 <= fx < self.nx and 0.0 <= fy < self.ny):
+            return self.OUTSIDE
+        ix, iy = int(fx), int(fy)
+        i = self._rows[ix, iy]
+        if i != self.EDGE:
+            return i
+        candidates = self._candidates.get((ix, iy))
+        if candidates is None:
+            candidates = self._candidates[(ix, iy)] = self._cell_candidates(ix, iy, polygons)
+        for i, exact in candidates:
+            if not exact or _point_in_polygon(x, y, polygons[i]):
+                return i
+        return self.OUTSIDE
+
+    def lookup(self, x: float, y: float) -> int:
+        """ Polygonindex der Zelle, OUTSIDE außerhalb des Gitters oder EDGE für eine exakte Prüfung. """
+        fx = (x - self.x0) / self.resolution
+        fy = (y - self.y0) / self.resolution
+        if not (0.0 <= fx < self.nx and 0.0 <= fy < self.ny):
+            return self.OUTSIDE
+        return self._rows[int(fx), int(fy)]
+
+    def lookup_batch(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """ Vektorisierte Variante von lookup für Arrays gleicher Form. """
+        fx = (x - self.x0) / self.resolution
+        fy = (y - self.y0) / self.resolution
+        on_grid = (fx >= 0.0) & (fx < self.nx) & (fy >= 0.0) & (fy < self.ny)
+        result = np.full(x.shape, self.OUTSIDE, dtype=np.intp)
+        result[on_grid] = self.cells[fx[on_grid].astype(np.intp), fy[on_grid].astype(np.intp)]
+        return result
+
+
+def _polygon_segments(polygons) -> np.ndarray:
+    """ Alle Polygonkanten als (E, 4)-Array x1, y1, x2, y2 (ohne Kanten der Länge 0). """
+    segments = []
+    for polygon in polygons:
+        vertices = np.asarray(polygon, dtype=float)
+        segments.append(np.hstack((vertices, np.roll(vertices, 1, axis=0))))
+    segments = np.concatenate(segments)
+    return segments[np.any(segments[:, :2] != segments[:, 2:], axis=1)]
+
+
+def _nearest_edge_vector(segments: np.ndarray, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """ Vektor vom nächstgelegenen Punkt aller Kanten zum Punkt (x, y), komponentenweise (dx, dy). """
+    best = np.full(x.shape, np.inf)
+    dx_best = np.zeros(x.shape)
+    dy_best = np.zeros(x.shape)
+    for x1, y1, x2, y2 in segments:
+        ex, ey = x2 - x1, y2 - y1
+        u = np.clip(((x - x1) * ex + (y - y1) * ey) / (ex * ex + ey * ey), 0.0, 1.0)
+        dx = x - (x1 + u * ex)
+        dy = y - (y1 + u * ey)
+        d2 = dx * dx + dy * dy
+        closer = d2 < best
+        best = np.where(closer, d2, best)
+        dx_best = np.where(closer, dx, dx_best)
+        dy_best = np.where(closer, dy, dy_best)
+    return dx_best, dy_best
+
+
+class DistanceField:
+    """
+    Vorzeichenbehafteter Abstand zur nächsten Polygonkante auf einem (Tevap, Tcond)-Gitter.
+    Positiv innerhalb des Kennfelds, negativ außerhalb; jede Zelle speichert zusätzlich den
+    Einheitsgradienten (Richtung zunehmenden Abstands). Innere Kanten zwischen Polygonen zählen
+    mit, da sich dort n1/n2 ändern. Werte gelten für die Zellmitte, der Abstand ist 1-Lipschitz.
+    """
+
+    def __init__(self, polygons, resolution: float = 0.5, border: float = 5.0):
+        vertices = np.concatenate([np.asarray(polygon, dtype=float) for polygon in polygons])
+        self.segments = _polygon_segments(polygons)
+        self.polygons = polygons
+        self.resolution = resolution
+        self.x0 = float(vertices[:, 0].min()) - border
+        self.y0 = float(vertices[:, 1].min()) - border
+        nx = int(np.ceil((vertices[:, 0].max() + border - self.x0) / resolution))
+        ny = int(np.ceil((vertices[:, 1].max() + border - self.y0) / resolution))
+
+        xg, yg = np.meshgrid(self.x0 + (np.arange(nx) + 0.5) * resolution,
+                             self.y0 + (np.arange(ny) + 0.5) * resolution, indexing='ij')
+        self.field = self._evaluate(xg, yg).astype(np.float32)
+        self.nx, self.ny = nx, ny
+        self._margins = self._safe_margins()
+
+    @classmethod
+    def from_field(cls, field: np.ndarray, x0: float, y0: float, resolution: float, polygons) -> 'DistanceField':
+        """ Übernimmt ein bereits berechnetes Feld (nx, ny, 3), z.B. aus der Binärdatei des Kennfelds. """
+        distance_field = cls.__new__(cls)
+        distance_field.segments = _polygon_segments(polygons)
+        distance_field.polygons = polygons
+        distance_field.resolution = resolution
+        distance_field.x0 = x0
+        distance_field.y0 = y0
+        distance_field.nx, distance_field.ny = field.shape[:2]
+        distance_field.field = field
+        distance_field._margins = distance_field._safe_margins()
+        return distance_field
+
+    def _safe_margins(self) -> memoryview:
+        """ Betrag des Abstands abzüglich halber Zelldiagonale (inkl. float32-Rundung), mindestens 0. """
+        margins = np.maximum(np.abs(self.field[..., 0].astype(float)) - 0.7072 * self.resolution, 0.0)
+        return memoryview(np.ascontiguousarray(margins))
+
+    def _evaluate(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """ Exakter Abstand und Gradient für beliebige Punkte, Ergebnis (..., 3). """
+        dx, dy = _nearest_edge_vector(self.segments, x, y)
+        distance = np.hypot(dx, dy)
+        sign = np.where(_locate_polygons(self.polygons, x, y) >= 0, 1.0, -1.0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Gradient des vorzeichenbehafteten Abstands: von der Kante weg, innen ins Kennfeld hinein
+            grad_x = np.where(distance > 0, sign * dx / distance, 0.0)
+            grad_y = np.where(distance > 0, sign * dy / distance, 0.0)
+        return np.stack((sign * distance, grad_x, grad_y), axis=-1)
+
+    def lookup(self, x: float, y: float) -> Tuple[float, float, float]:
+        """
+        (Abstand, Gradient x, Gradient y) der Zelle des Punkts. Der Abstand ist um die halbe
+        Zelldiagonale zur Kante hin verkleinert und damit eine sichere Untergrenze des Betrags.
+        Außerhalb des Gitters wird exakt gerechnet.
+        """
+        fx = (x - self.x0) / self.resolution
+        fy = (y - self.y0) / self.resolution
+        if 0.0 <= fx < self.nx and 0.0 <= fy < self.ny:
+            distance, grad_x, grad_y = self.field[int(fx), int(fy)].tolist()
+            margin = self._margins[int(fx), int(fy)]
+        else:
+            exact = self._evaluate(np.array([x], dtype=float), np.array([y], dtype=float))
+            distance, grad_x, grad_y = exact[0].tolist()
+            margin = abs(distance)
+        return (margin if distance >= 0 else -margin), grad_x, grad_y
+
+    def margin(self, x: float, y: float) -> float:
         """
+        Betrag des Abstands wie in lookup, ohne Gradient. Außerhalb des Gitters 0, d.h. keine
+        Aussage statt exakter Rechnung.
+        """
+        fx = (x - self.x0) / self.resolution
+        fy = (y - self.y0) / self.resolution
+        if 0.0 <= fx < self.nx and 0.0 <= fy < self.ny:
+            return self._margins[int(fx), int(fy)]
+        return 0.0
+
+
+# Ecken einer Gitterzelle für die trilineare Interpolation
+_CELL_CORNERS = np.array([(i, j, k) for i in (0, 1) for j in (0, 1) for k in (0, 1)])
+
+
+class SuperheatCorrection:
+    """
+    Überhitzungskorrektur auf einem gleichmäßigen (Tevap, Tcond, Überhitzung)-Gitter, offline mit
+    corrSH_PolyScroll erzeugt (Make_json_Compressor_file.py). Bezug ist die Kennfeld-Überhitzung von 10 K:
+    Massenstrom und Kälteleistung als Faktor, Heißgastemperatur als Zuschlag in K.
+    Zwischen den Gitterpunkten trilinear, außerhalb des Gitters auf den Rand begrenzt.
+    """
+
+    COMPONENTS = ("massflow", "tdischarge", "capacity")
+    AXES = ("t_evap", "t_cond", "superheat")
+
+    def __init__(self, t_evap, t_cond, superheat, massflow, tdischarge, capacity):
+        self.axes = tuple(np.asarray(axis, dtype=float) for axis in (t_evap, t_cond, superheat))
+        for axis in self.axes:
+            if len(axis) < 2 or not np.allclose(np.diff(axis), axis[1] - axis[0]):
+                raise ValueError("SuperheatCorrection: Gitterachsen müssen gleichmäßig sein")
+        self.values = np.stack([np.asarray(v, dtype=float) for v in (massflow, tdischarge, capacity)], axis=-1)
+        if self.values.shape[:3] != tuple(len(axis) for axis in self.axes):
+            raise ValueError("SuperheatCorrection: Werte passen nicht zu den Gitterachsen")
+        self._origin = np.array([axis[0] for axis in self.axes])
+        self._step = np.array([axis[1] - axis[0] for axis in self.axes])
+        self._upper = np.array([len(axis) - 1 for axis in self.axes])
+        self._scalar_axes = tuple(zip(self._origin.tolist(), self._step.tolist(), self._upper.tolist()))
+        self._rows = self.values.tolist()  # für skalare Abfragen ohne NumPy-Overhead
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'SuperheatCorrection':
+        return cls(*(data[key] for key in cls.AXES + cls.COMPONENTS))
+
+    def to_dict(self) -> dict:
+        data = {key: axis.tolist() for key, axis in zip(self.AXES, self.axes)}
+        data.update({key: self.values[..., i].tolist() for i, key in enumerate(self.COMPONENTS)})
+        return data
+
+    def interpolate(self, t_evap, t_cond, superheat) -> np.ndarray:
+        """ Korrektur (Massenstromfaktor, Heißgaszuschlag, Leistungsfaktor), Ergebnis (..., 3). """
+        if all(isinstance(v, (int, float)) for v in (t_evap, t_cond, superheat)):
+            return np.array(self.interpolate_scalar(t_evap, t_cond, superheat))
+        points = np.stack(np.broadcast_arrays(t_evap, t_cond, superheat), axis=-1).astype(float)
+        f = np.clip((points - self._origin) / self._step, 0.0, self._upper)
+        i = np.minimum(f.astype(int), self._upper - 1)
+        w = (f - i)[..., None, :]
+        index = i[..., None, :] + _CELL_CORNERS
+        weights = np.prod(np.where(_CELL_CORNERS, w, 1.0 - w), axis=-1)
+        corners = self.values[index[..., 0], index[..., 1], index[..., 2]]
+        return np.einsum('...c,...ck->...k', weights, corners)
+
+    def interpolate_scalar(self, t_evap: float, t_cond: float, superheat: float) -> List[float]:
+        """ Wie interpolate für einen Punkt, ohne NumPy-Overhead; Ergebnis als Liste. """
+        index = []
+        weights = []
+        for value, (origin, step, upper) in zip((t_evap, t_cond, superheat), self._scalar_axes):
+            f = min(max((value - origin) / step, 0.0), upper)
+            i = min(int(f), upper - 1)
+            index.append(i)
+            weights.append(f - i)
+        (i, j, k), (wx, wy, wz) = index, weights
+        rows = self._rows
+        result = [0.0, 0.0, 0.0]
+        for di, w_i in ((0, 1.0 - wx), (1, wx)):
+            for dj, w_j in ((0, 1.0 - wy), (1, wy)):
+                cell = rows[i + di][j + dj]
+                w_ij = w_i * w_j
+                for dk, w_k in ((0, 1.0 - wz), (1, wz)):
+                    weight = w_ij * w_k
+                    c = cell[k + dk]
+                    result[0] += weight * c[0]
+                    result[1] += weight * c[1]
+                    result[2] += weight * c[2]
+        return result
+
+
+class MapCache:
+    """
+    Begrenzter LRU-Ergebnisspeicher für Kennfeldabfragen.
+    Schlüssel sind die auf 'resolution' quantisierten Eingänge; Treffer-, Fehl- und
+    Verdrängungszähler dienen zur Dimensionierung von maxsize.
+    """
+
+    def __init__(self, maxsize: int = 4096, resolution: float = 0.1):
+        if maxsize <= 0 or resolution <= 0:
+            raise ValueError("MapCache: maxsize und resolution müssen größer 0 sein")
+        self.maxsize = maxsize
+        self.resolution = resolution
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def quantize(self, value: float) -> int:
+        return round(value / self.resolution)
+
+    def get(self, key):
+        """ Liefert den gespeicherten Wert oder None und führt die Statistik. """
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self._entries[key] = value
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """ Verwirft alle Einträge, z.B. nach dem Neuladen der Koeffizienten. Die Statistik bleibt erhalten. """
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {"size": len(self._entries), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "hit_rate": self.hits / lookups if lookups else 0.0}
+
+
+# Binärformat der Kennfelder (neben der JSON-Datei, Endung BINARY_SUFFIX):
+# Kopf (Kennung, Version, Anzahl Arrays, SHA-256 der Quell-JSON, CRC32 der Nutzdaten),
+# Inhaltsverzeichnis (Name, dtype, Form, Offset) und danach die Arrays zusammenhängend, 8-Byte-ausgerichtet.
+BINARY_SUFFIX = '.cmap'
+BINARY_MAGIC = b'FM2CMAP\0'
+BINARY_VERSION = 1
+_BINARY_HEADER = struct.Struct('<8sII32sI')
+_BINARY_ENTRY = struct.Struct('<16s4s3IQ')
+
+
+def file_digest(file_path) -> bytes:
+    """ SHA-256 einer Datei, dient zur Erkennung veralteter Binärkennfelder. """
+    with open(file_path, 'rb') as f:
+        return hashlib.sha256(f.read()).digest()
+
+
+def write_binary_arrays(binary_path, arrays: dict, source_digest: bytes):
+    """ Schreibt benannte Arrays (max. 3 Dimensionen) im Binärformat der Kennfelder. """
+    entries = []
+    payload = bytearray()
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        dtype = array.dtype.str.encode()
+        shape = array.shape + (0,) * (3 - array.ndim)
+        entries.append(_BINARY_ENTRY.pack(name.encode(), dtype, *shape, len(payload)))
+        payload += array.tobytes()
+        payload += bytes(-len(payload) % 8)
+
+    header = _BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, len(entries), source_digest, zlib.crc32(payload))
+    toc = b''.join(entries)
+    with open(binary_path, 'wb') as f:
+        f.write(header)
+        f.write(toc)
+        f.write(bytes(-(len(header) + len(toc)) % 8))
+        f.write(payload)
+
+
+def read_binary_arrays(binary_path) -> Tuple[bytes, dict]:
+    """
+    Öffnet ein Binärkennfeld per np.memmap und liefert (SHA-256 der Quelle, {Name: Array}).
+    Die Arrays sind schreibgeschützte Sichten auf die Datei. Bei falscher Kennung,
+    Version oder Prüfsumme wird ein ValueError ausgelöst.
+    """
+    with open(binary_path, 'rb') as f:
+        magic, version, count, source_digest, crc = _BINARY_HEADER.unpack(f.read(_BINARY_HEADER.size))
+        if magic != BINARY_MAGIC or version != BINARY_VERSION:
+            raise ValueError(f"{binary_path}: kein Kennfeld im Binärformat Version {BINARY_VERSION}")
+        toc = [_BINARY_ENTRY.unpack(f.read(_BINARY_ENTRY.size)) for _ in range(count)]
+
+    data_start = _BINARY_HEADER.size + count * _BINARY_ENTRY.size
+    data_start += -data_start % 8
+    payload = np.memmap(binary_path, dtype=np.uint8, mode='r', offset=data_start)
+    if zlib.crc32(payload) != crc:
+        raise ValueError(f"{binary_path}: Prüfsumme der Daten stimmt nicht")
+
+    arrays = {}
+    for name, dtype, d0, d1, d2, offset in toc:
+        shape = tuple(d for d in (d0, d1, d2) if d)
+        dtype = np.dtype(dtype.rstrip(b'\0').decode())
+        nbytes = int(np.prod(shape)) * dtype.itemsize
+        # ndarray-Sicht ohne Kopie: np.memmap als Unterklasse verteuert jeden skalaren Zugriff
+        arrays[name.rstrip(b'\0').decode()] = payload[offset:offset + nbytes].view(dtype).reshape(shape).view(np.ndarray)
+    return source_digest, arrays
+
+
+class CompressorMap:
+    """
+    Unveränderliche Kennfelddaten eines Verdichtertyps (Koeffizienten, Polygone, Drehzahlgrenzen,
+    Rasterindex, Abstandsfeld und optional Überhitzungskorrektur). Eine Instanz wird von allen
+    Compressor-Objekten desselben Typs geteilt.
+    """
+
+    def __init__(self, poly_data, polygons, n1_values, n2_values, envelope_resolution: float = 0.25,
+                 envelope_index: EnvelopeIndex = None, distance_field: DistanceField = None,
+                 superheat_correction: SuperheatCorrection = None):
+        self.poly_data = tuple(float(c) for c in poly_data)
+        self.polygons = tuple(tuple(tuple(point) for point in polygon) for polygon in polygons)
+        self.n1_values = tuple(n1_values)
+        self.n2_values = tuple(n2_values)
+        self.n1_array = np.asarray(self.n1_values, dtype=float)
+        self.n2_array = np.asarray(self.n2_values, dtype=float)
+        self.coefficients = np.asarray(self.poly_data, dtype=float).reshape(len(POLY_COMPONENTS), 30)
+        self.output_matrix = _OUTPUT_COMBINATION @ self.coefficients
+        # Ausgangsmatrix aufgeteilt nach Drehzahlpotenz: output = sum_p speed**p * (temps @ speed_matrices[p].T)
+        self.speed_matrices = np.stack([self.output_matrix * (_SPEED_POWER == p) for p in range(3)])
+        if envelope_index is None or envelope_index.resolution != envelope_resolution:
+            envelope_index = EnvelopeIndex(self.polygons, envelope_resolution)
+        self.envelope_index = envelope_index
+        self.distance_field = distance_field if distance_field is not None else DistanceField(self.polygons)
+        self.superheat_correction = superheat_correction
+        for array in (self.coefficients, self.output_matrix, self.speed_matrices, self.n1_array, self.n2_array,
+                      self.envelope_index.cells, self.distance_field.field):
+            array.flags.writeable = False
+        if superheat_correction is not None:
+            superheat_correction.values.flags.writeable = False
+
+    @classmethod
+    def from_json(cls, json_file_path, envelope_resolution: float = 0.25) -> 'CompressorMap':
         try:
             with open(json_file_path, 'r') as f:
                 data = json.load(f)
-            self.poly_data = data["poly_data"]
-            self.polygons = data["polygons"]
-            self.n1_values = data["n1_values"]
-            self.n2_values = data["n2_values"]
+            superheat_correction = None
+            if "superheat_correction" in data:
+                superheat_correction = SuperheatCorrection.from_dict(data["superheat_correction"])
+            compressor_map = cls(data["poly_data"], data["polygons"], data["n1_values"], data["n2_values"],
+                                 envelope_resolution, superheat_correction=superheat_correction)
             print(f"Daten erfolgreich aus {json_file_path} geladen.")
         except FileNotFoundError:
             print(f"Fehler: Die Datei {json_file_path} wurde nicht gefunden.")
             raise
+        return compressor_map
+
+    @classmethod
+    def from_binary(cls, binary_path, envelope_resolution: float = 0.25, json_file_path=None) -> 'CompressorMap':
+        """
+        Lädt das Kennfeld aus der Binärdatei. Ist json_file_path angegeben, muss die
+        Binärdatei aus genau dieser JSON-Datei erzeugt worden sein, sonst ValueError.
+        """
+        source_digest, arrays = read_binary_arrays(binary_path)
+        if json_file_path is not None and source_digest != file_digest(json_file_path):
+            raise ValueError(f"{binary_path}: veraltet gegenüber {json_file_path}")
+
+        offsets = arrays["polygon_offsets"].astype(int)
+        vertices = arrays["vertices"]
+        polygons = [vertices[offsets[i]:offsets[i + 1]].tolist() for i in range(len(offsets) - 1)]
+        x0, y0, resolution = arrays["envelope_grid"].tolist()
+        envelope_index = EnvelopeIndex.from_cells(arrays["envelope_cells"], x0, y0, resolution)
+        distance_field = None
+        if "distance_field" in arrays:
+            x0, y0, resolution = arrays["distance_grid"].tolist()
+            distance_field = DistanceField.from_field(arrays["distance_field"], x0, y0, resolution, polygons)
+        superheat_correction = None
+        if "sh_massflow" in arrays:
+            superheat_correction = SuperheatCorrection(*(arrays["sh_" + key] for key in
+                                                         SuperheatCorrection.AXES + SuperheatCorrection.COMPONENTS))
+        compressor_map = cls(arrays["coefficients"].ravel().tolist(), polygons, arrays["n1_values"].tolist(),
+                             arrays["n2_values"].tolist(), envelope_resolution, envelope_index, distance_field,
+                             superheat_correction)
+        print(f"Daten erfolgreich aus {binary_path} geladen.")
+        return compressor_map
+
+    @classmethod
+    def load(cls, json_file_path, envelope_resolution: float = 0.25) -> 'CompressorMap':
+        """
+        Bevorzugt die Binärdatei neben der JSON-Datei; fehlt sie, ist sie veraltet oder
+        beschädigt, wird die JSON-Datei gelesen.
+        """
+        binary_path = Path(json_file_path).with_suffix(BINARY_SUFFIX)
+        if binary_path.exists():
+            try:
+                return cls.from_binary(binary_path, envelope_resolution,
+                                       json_file_path if Path(json_file_path).exists() else None)
+            except ValueError as e:
+                print(f"Binärkennfeld wird ignoriert: {e}")
+        return cls.from_json(json_file_path, envelope_resolution)
+
+    def check_polygon_batch(self, Tevaporation, Tcondensing) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Betriebsgrenzen für viele Punkte, siehe Compressor.check_polygon_batch.
+        """
+        x, y = (a.ravel() for a in np.broadcast_arrays(np.asarray(Tevaporation, dtype=float),
+                                                       np.asarray(Tcondensing, dtype=float)))
+        found = self.envelope_index.lookup_batch(x, y)
+        edge = found == EnvelopeIndex.EDGE
+        if edge.any():
+            found[edge] = _locate_polygons(self.polygons, x[edge], y[edge])
+
+        is_inside = found >= 0
+        n1 = np.zeros(x.shape)
+        n2 = np.zeros(x.shape)
+        n1[is_inside] = self.n1_array[found[is_inside]]
+        n2[is_inside] = self.n2_array[found[is_inside]]
+        return is_inside, n1, n2
+
+    def to_binary(self, binary_path, source_digest: bytes):
+        """ Schreibt das Kennfeld inkl. Rasterindex, Abstandsfeld und Überhitzungskorrektur als Binärdatei. """
+        index = self.envelope_index
+        arrays = {
+            "coefficients": self.coefficients,
+            "vertices": np.concatenate([np.asarray(polygon, dtype=float) for polygon in self.polygons]),
+            "polygon_offsets": np.cumsum([0] + [len(polygon) for polygon in self.polygons]).astype(float),
+            "n1_values": np.asarray(self.n1_values, dtype=float),
+            "n2_values": np.asarray(self.n2_values, dtype=float),
+            "envelope_grid": np.array([index.x0, index.y0, index.resolution]),
+            "envelope_cells": index.cells,
+            "distance_grid": np.array([self.distance_field.x0, self.distance_field.y0, self.distance_field.resolution]),
+            "distance_field": self.distance_field.field,
+        }
+        correction = self.superheat_correction
+        if correction is not None:
+            arrays.update({"sh_" + key: axis for key, axis in zip(SuperheatCorrection.AXES, correction.axes)})
+            arrays.update({"sh_" + key: np.ascontiguousarray(correction.values[..., i])
+                           for i, key in enumerate(SuperheatCorrection.COMPONENTS)})
+        write_binary_arrays(binary_path, arrays, source_digest)
+
+
+def write_binary_map(json_file_path, envelope_resolution: float = 0.25) -> Path:
+    """ Erzeugt die Binärdatei neben einer Kennfeld-JSON-Datei und gibt deren Pfad zurück. """
+    binary_path = Path(json_file_path).with_suffix(BINARY_SUFFIX)
+    CompressorMap.from_json(json_file_path, envelope_resolution).to_binary(binary_path, file_digest(json_file_path))
+    return binary_path
+
+
+class CompressorOutput(NamedTuple):
+    """
+    Gemeinsames Ergebnis aller Verdichter-Backends (CompressorBackend.evaluate), je Feld ein (N,)-Array.
+    Einheiten wie in den Daten des jeweiligen Verdichters, nicht vorhandene Größen sind NaN.
+    valid: Betriebspunkt innerhalb der Gültigkeit des Backends (Einsatzgrenzen, Drehzahl- bzw. Leistungsbereich).
+    """
+    qheat: np.ndarray
+    epower: np.ndarray
+    massflow: np.ndarray
+    ecurrent: np.ndarray
+    capacity: np.ndarray
+    cop: np.ndarray
+    Tdischarge: np.ndarray
+    valid: np.ndarray
+
+    @classmethod
+    def from_direct(cls, values: np.ndarray, valid: np.ndarray) -> 'CompressorOutput':
+        """ Aus den 8 Ausgängen von calculate_direct als (8, ...)-Array, z.B. calculate_direct_batch(...).T """
+        qheat, epower, massflow, ecurrent, capacity, cop, tdischarge, _ = (np.ravel(v) for v in values)
+        return cls(qheat, epower, massflow, ecurrent, capacity, cop, tdischarge, np.ravel(valid).astype(bool))
+
+
+class CompressorBackend(Protocol):
+    """
+    Schnittstelle aller Verdichtermodelle: evaluate wertet Arrays von Betriebspunkten aus (Broadcasting,
+    flach gelegt). speed_or_load ist je nach Modell die Drehzahl (rps) oder die Leistung (%, TurboCor).
+    """
+
+    def evaluate(self, speed_or_load, t_suction, t_condensation) -> CompressorOutput:
+        ...
+
+
+# Prozessweites Register der geladenen Kennfelder, Schlüssel ist der Verdichtertyp (z.B. 'VZN175')
+MAP_DIRECTORY = Path(__file__).parent / 'json_data_cmp'
+_compressor_maps = {}
+
+
+def get_compressor_map(compressor_type: str) -> CompressorMap:
+    """ Liefert das gemeinsame Kennfeld eines Verdichtertyps; die Datei wird nur beim ersten Aufruf gelesen. """
+    compressor_map = _compressor_maps.get(compressor_type)
+    if compressor_map is None:
+        compressor_map = CompressorMap.load(MAP_DIRECTORY / f'{compressor_type}.json')
+        _compressor_maps[compressor_type] = compressor_map
+    return compressor_map
+
+
+def clear_compressor_maps():
+    """ Leert das Register, damit geänderte Kennfelddateien neu gelesen werden (inkl. der Backends). """
+    _compressor_maps.clear()
+    _backends.clear()
+
+
+# Verdichter aus Ausgangsroutinen_und_Daten/TurboCor.py: Typ -> (Klasse, Argumente); das Modul benötigt pandas,
+# scipy und CoolProp und wird erst beim ersten get_backend eines dieser Typen importiert
+LEGACY_MODULE = 'ControllerModel.EM_Compressor.Ausgangsroutinen_und_Daten.TurboCor'
+_LEGACY_BACKENDS = {
+    'TGH285': ('TurboCor', 'TGH285'),  # R134a/R515A
+    'TTH375': ('TurboCor', 'TTH375'),  # R1234ze/R513B
+    'TGH285_noEcon': ('TurboCor_noEcon', 'TGH285'),
+    'TTH375_noEcon': ('TurboCor_noEcon', 'TTH375'),
+    'AVB87DA203_50kW': ('PolyScroll', 'Belaria_100_R32_Mitsubishi_Polynome_AVB87DA203_50kW.csv', [30, 60, 100, 120]),
+    'DSG480_4_120kW': ('fix_PolyScroll', 'R515B_System_Polynome_DSG480_4_120kW.csv', 58),
+    'DSG480_4R_120kW': ('fix_PolyScroll', 'R1234ze_System_Polynome_DSG480_4_120kW.csv', 58),
+    'YH33K1G_33kW': ('fix_PolyScroll', 'R290_Emerson_YH33K1G.csv', 50),
+}
+_backend_factories = {}
+_backends = {}
+
+
+def register_backend(compressor_type: str, factory: Callable[[], CompressorBackend]):
+    """ Registriert eine Fabrik für einen Verdichtertyp; ein bereits erzeugtes Backend wird verworfen. """
+    _backend_factories[compressor_type] = factory
+    _backends.pop(compressor_type, None)
+
+
+def _legacy_backend(class_name: str, *args) -> CompressorBackend:
+    return getattr(importlib.import_module(LEGACY_MODULE), class_name)(*args)
+
+
+def get_backend(compressor_type: str) -> CompressorBackend:
+    """
+    Liefert das gemeinsame Backend eines Verdichtertyps: registrierte Fabrik, sonst das Kennfeld aus
+    MAP_DIRECTORY (Compressor) oder einer der Verdichter aus TurboCor.py. Erzeugt wird nur beim ersten Aufruf.
+    """
+    backend = _backends.get(compressor_type)
+    if backend is None:
+        factory = _backend_factories.get(compressor_type)
+        if factory is not None:
+            backend = factory()
+        elif (MAP_DIRECTORY / f'{compressor_type}.json').exists():
+            backend = Compressor.from_type(compressor_type)
+        elif compressor_type in _LEGACY_BACKENDS:
+            backend = _legacy_backend(*_LEGACY_BACKENDS[compressor_type])
+        else:
+            raise KeyError(f"EM_Compressor: kein Backend für den Verdichtertyp {compressor_type}")
+        _backends[compressor_type] = backend
+    return backend
+
+
+def _solve_speed(a0, a1, a2, target, n1, n2):
+    """
+    Löst a2*n^2 + a1*n + a0 = target numerisch stabil (für a2 = 0 linear) im Bereich n1..n2.
+    Liegt keine Lösung im Bereich, wird die Grenze mit der geringsten Abweichung gewählt.
+    """
+    c = a0 - target
+    with np.errstate(divide='ignore', invalid='ignore'):
+        disc = np.sqrt(a1 * a1 - 4.0 * a2 * c)
+        q = -0.5 * (a1 + np.copysign(disc, a1))
+        root1 = np.where(a2 != 0, q / a2, -c / a1)
+        root2 = c / q
+    in1 = (root1 >= n1) & (root1 <= n2)
+    in2 = (root2 >= n1) & (root2 <= n2)
+    speed = np.where(in1 & in2, np.minimum(root1, root2), np.where(in1, root1, root2))
+
+    at_n1 = np.abs(a0 + n1 * (a1 + n1 * a2) - target)
+    at_n2 = np.abs(a0 + n2 * (a1 + n2 * a2) - target)
+    return np.where(in1 | in2, speed, np.where(at_n1 <= at_n2, n1, n2))
+
+
+class OperatingSlice:
+    """
+    Kennfeld eines Verdichters bei festen Temperaturen, erzeugt mit Compressor.slice_at.
+    Jeder Ausgang ist a0 + a1*speed + a2*speed^2, die Drehzahlgrenzen n1/n2 sind bereits aufgelöst.
+    """
+
+    __slots__ = ("t_suction", "t_condensation", "a0", "a1", "a2", "_rows", "is_inside", "n1", "n2")
+
+    def __init__(self, t_suction: float, t_condensation: float, coefficients: np.ndarray,
+                 is_inside: bool, n1: float, n2: float):
+        self.t_suction = t_suction
+        self.t_condensation = t_condensation
+        self.a0, self.a1, self.a2 = (np.ascontiguousarray(coefficients[:, p]) for p in range(3))
+        self._rows = coefficients.tolist()  # für skalare Abfragen ohne NumPy-Overhead
+        self.is_inside = is_inside
+        self.n1 = n1
+        self.n2 = n2
+
+    def calculate(self, speed) -> np.ndarray:
+        """
+        Ausgänge wie calculate_direct; für ein Drehzahl-Array ein (N, 8)-Array.
+        """
+        if isinstance(speed, (int, float)):
+            result = [c0 + speed * (c1 + speed * c2) for c0, c1, c2 in self._rows]
+            epower = result[1]
+            result[5] = result[0] / epower if epower != 0 else 0
+            return np.array(result)
+        speed = np.asarray(speed, dtype=float).reshape(-1, 1)
+        result = self.a0 + speed * (self.a1 + speed * self.a2)
+        qheat = result[:, 0]
+        epower = result[:, 1]
+        np.divide(qheat, epower, out=result[:, 5], where=epower != 0)
+        return result
+
+    def limit(self, speed):
+        """ Begrenzt auf n1..n2 ohne die Zähler des speed_limiter; außerhalb des Kennfelds unverändert. """
+        if not self.is_inside:
+            return speed
+        return np.clip(speed, self.n1, self.n2)
+
+    def speed_for_qheat(self, q_target):
+        """ Drehzahl für die Soll-Heizleistung im Bereich n1..n2, außerhalb des Kennfelds NaN. """
+        return self._speed_for_output(0, q_target)
+
+    def speed_for_epower(self, p_target):
+        return self._speed_for_output(1, p_target)
+
+    def _speed_for_output(self, column: int, target):
+        if not self.is_inside:
+            return np.full(np.shape(target), np.nan)
+        return _solve_speed(self.a0[column], self.a1[column], self.a2[column], np.asarray(target, dtype=float),
+                            self.n1, self.n2)
+
+
+class Compressor:
+    """
+    Objektorientiertes Equipment-Modul für einen Verdichter.
+    Liess Polynom-Koeffizienten und Betriebsgrenzen aus einer JSON-Datei.
+    """
+
+    def __init__(self, json_file_path=None, high_value_temporary_out_of_field: int = 300,
+                 envelope_resolution: float = 0.25, compressor_map: CompressorMap = None):
+        """
+        Initialisiert das Objekt durch Laden der Daten aus der JSON-Datei
+        und Initialisieren der Zähler.
+        Alternativ wird ein bereits geladenes, gemeinsames Kennfeld (compressor_map) übernommen.
+        """
+        self.envelope_resolution = envelope_resolution
+        self.cache = None  # optionaler MapCache, siehe enable_cache
+        if compressor_map is not None:
+            self.use_map(compressor_map)
+        else:
+            self.load(json_file_path)
 
         # Initialisierung der neuen Zähler
         self.limit_speed = 0
@@ -36,10 +908,87 @@ class Compressor:
         self.temporary_out_of_field = 0
         self.high_value_temporary_out_of_field = high_value_temporary_out_of_field
 
+    @classmethod
+    def from_type(cls, compressor_type: str, high_value_temporary_out_of_field: int = 300) -> 'Compressor':
+        """ Verdichter mit eigenen Zählern auf dem gemeinsamen Kennfeld aus dem Register. """
+        return cls(high_value_temporary_out_of_field=high_value_temporary_out_of_field,
+                   compressor_map=get_compressor_map(compressor_type))
+
+    def load(self, json_file_path):
+        """
+        Lädt Polynom-Koeffizienten und Betriebsgrenzen (neu) aus der JSON-Datei
+        bzw. der gültigen Binärdatei daneben. Ein aktiver Ergebnisspeicher wird dabei geleert.
+        """
+        self.use_map(CompressorMap.load(json_file_path, self.envelope_resolution))
+
+    def use_map(self, compressor_map: CompressorMap):
+        """ Übernimmt ein Kennfeld; die Daten werden referenziert, nicht kopiert. """
+        self.map = compressor_map
+        self.poly_data = compressor_map.poly_data
+        self.polygons = compressor_map.polygons
+        self.n1_values = compressor_map.n1_values
+        self.n2_values = compressor_map.n2_values
+        self.coefficients = compressor_map.coefficients
+        self._output_matrix = compressor_map.output_matrix
+        self._speed_matrices = compressor_map.speed_matrices
+        self.envelope_index = compressor_map.envelope_index
+        self.distance_field = compressor_map.distance_field
+        self.superheat_correction = compressor_map.superheat_correction
+        self._envelope_hold = None
+
+        if self.cache is not None:
+            self.cache.clear()
+
+    def enable_cache(self, maxsize: int = 4096, resolution: float = 0.1):
+        """
+        Aktiviert den LRU-Ergebnisspeicher für calculate_direct und check_polygon.
+        Die Eingänge werden auf 'resolution' gerundet und am gerundeten Punkt berechnet,
+        die Ergebnisse weichen daher um bis zu resolution/2 in den Eingängen ab.
+        """
+        self.cache = MapCache(maxsize, resolution)
+
+    def disable_cache(self):
+        self.cache = None
+
+    def cache_stats(self) -> dict:
+        """ Treffer, Fehlzugriffe und Verdrängungen des Ergebnisspeichers (leer, wenn deaktiviert). """
+        return self.cache.stats() if self.cache is not None else {}
+
     def check_polygon(self, Tevaporation: float, Tcondensing: float) -> Tuple[bool, float, float]:
         """
         Überprüft, ob der Punkt [Tevaporation, Tcondensing] innerhalb
         eines der Polygone liegt und gibt die zugehörigen n1- und n2-Werte zurück.
+        Die Abfrage geht über den Rasterindex, nur Kantenzellen werden exakt geprüft.
+        """
+        cache = self.cache
+        if cache is not None:
+            key = ("polygon", cache.quantize(Tevaporation), cache.quantize(Tcondensing))
+            result = cache.get(key)
+            if result is None:
+                result = self._check_polygon_indexed(key[1] * cache.resolution, key[2] * cache.resolution)
+                cache.put(key, result)
+            return result
+        return self._check_polygon_indexed(Tevaporation, Tcondensing)
+
+    def _check_polygon_indexed(self, Tevaporation: float, Tcondensing: float) -> Tuple[bool, float, float]:
+        i = self.envelope_index.locate(Tevaporation, Tcondensing, self.polygons)
+        if i < 0:
+            return False, 0.0, 0.0
+        return True, self.n1_values[i], self.n2_values[i]
+
+    def check_polygon_batch(self, Tevaporation, Tcondensing) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Vektorisierte Variante von check_polygon für viele Betriebspunkte.
+        Eingänge werden gebroadcastet und flach gelegt; Ergebnis sind die Arrays
+        (is_inside, n1, n2) der Länge N mit n1 = n2 = 0.0 außerhalb des Kennfelds.
+        """
+        return self.map.check_polygon_batch(Tevaporation, Tcondensing)
+
+    def check_polygon_exact(self, Tevaporation: float, Tcondensing: float) -> Tuple[bool, float, float]:
+        """
+        Überprüft, ob der Punkt [Tevaporation, Tcondensing] innerhalb
+        eines der Polygone liegt und gibt die zugehörigen n1- und n2-Werte zurück.
+        Exaktes Ray-Casting über alle Polygone, das erste Polygon mit Treffer gewinnt.
         """
         x, y = Tevaporation, Tcondensing
 
@@ -64,13 +1013,39 @@ class Compressor:
 
         return False, 0.0, 0.0
 
+    def envelope_margin(self, Tevaporation: float, Tcondensing: float) -> Tuple[float, float, float]:
+        """
+        Abstand des Betriebspunkts zur nächsten Kennfeldgrenze in K (positiv innen, negativ außen)
+        und Gradient (Richtung ins Kennfeld). Innerhalb dieses Abstands ändert sich das
+        Ergebnis von check_polygon nicht; margin + gradient · (dTevap, dTcond) schätzt den
+        Abstand nach der nächsten Änderung der Temperaturen.
+        """
+        return self.distance_field.lookup(Tevaporation, Tcondensing)
+
+    def _check_polygon_held(self, Tevaporation: float, Tcondensing: float) -> Tuple[bool, float, float]:
+        """
+        check_polygon mit Wiederverwendung des letzten Ergebnisses, solange der Punkt innerhalb
+        des Abstands zur nächsten Kennfeldgrenze um den zuletzt geprüften Punkt bleibt.
+        Ohne positiven Abstand (Randzellen, außerhalb des Gitters) wird nichts gehalten.
+        """
+        hold = self._envelope_hold
+        if hold is not None:
+            x, y, radius_sq, result = hold
+            if (Tevaporation - x) ** 2 + (Tcondensing - y) ** 2 < radius_sq:
+                return result
+        result = self.check_polygon(Tevaporation, Tcondensing)
+        radius = self.distance_field.margin(Tevaporation, Tcondensing)
+        self._envelope_hold = (Tevaporation, Tcondensing, radius * radius, result) if radius > 0.0 else None
+        return result
+
     def speed_limiter(self, speed: float, T_evaporation: float, T_condensing: float) -> float:
         """
         Begrenzt die Geschwindigkeit basierend auf den Betriebsgrenzen des Verdichters.
         Erhöht Zähler für Fehlerfälle und löst eine Exception aus, wenn die
         Betriebsgrenzen zu lange überschritten werden.
+        Bei großem Abstand zur Kennfeldgrenze entfällt die Polygonprüfung (siehe envelope_margin).
         """
-        is_inside, n1, n2 = self.check_polygon(T_evaporation, T_condensing)
+        is_inside, n1, n2 = self._check_polygon_held(T_evaporation, T_condensing)
 
         if is_inside:
             self.temporary_out_of_field = 0
@@ -93,53 +1068,192 @@ class Compressor:
     def calculate_direct(self, speed: float, t_suction: float, t_condensation: float) -> np.ndarray:
         """
         Berechnung der Heizparameter mit polynomialen Koeffizienten.
+        Ein Basisvektor mal Ausgangsmatrix liefert alle Ausgänge, nur der COP wird nachgerechnet.
         """
-        poly_data = self.poly_data
+        cache = self.cache
+        if cache is not None:
+            key = ("direct", cache.quantize(speed), cache.quantize(t_suction), cache.quantize(t_condensation))
+            result = cache.get(key)
+            if result is None:
+                result = self._calculate_direct(key[1] * cache.resolution, key[2] * cache.resolution,
+                                                key[3] * cache.resolution)
+                cache.put(key, result)
+            return result.copy()
+        return self._calculate_direct(speed, t_suction, t_condensation)
 
-        def calculate_component(il, co, speed, t_suc, t_con, data):
-            # Hilfsfunktion zur wiederkehrenden Berechnung
-            base = float(data[il + co]) \
-                   + data[il + co + 1] * t_suc \
-                   + data[il + co + 2] * t_con \
-                   + data[il + co + 3] * t_suc ** 2 \
-                   + data[il + co + 4] * t_con ** 2
+    def _calculate_direct(self, speed: float, t_suction: float, t_condensation: float) -> np.ndarray:
+        result = self._output_matrix @ np.array(_monomial_terms(speed, t_suction, t_condensation))
+        epower = result[1]
+        result[5] = result[0] / epower if epower != 0 else 0
+        return result
 
-            term1 = t_suc * t_con * (
-                    (speed ** 2) * (data[il + co + 5] + data[il + co + 6] * t_suc + data[il + co + 7] * t_con) +
-                    speed * (data[il + co + 8] + data[il + co + 9] * t_suc + data[il + co + 10] * t_con) +
-                    data[il + co + 11] + data[il + co + 12] * t_suc + data[il + co + 13] * t_con
-            )
+    def calculate_direct_batch(self, speed, t_suction, t_condensation) -> np.ndarray:
+        """
+        Vektorisierte Variante von calculate_direct für ganze Kennfelder.
+        Drehzahl und Temperaturen werden nach NumPy-Regeln gebroadcastet und flach gelegt.
+        Ergebnis ist ein (N, 8)-Array mit derselben Spaltenreihenfolge wie calculate_direct.
+        """
+        basis = monomial_basis(np.asarray(speed, dtype=float),
+                               np.asarray(t_suction, dtype=float),
+                               np.asarray(t_condensation, dtype=float)).reshape(-1, 30)
+        result = basis @ self._output_matrix.T
+        qheat = result[:, 0]
+        epower = result[:, 1]
+        np.divide(qheat, epower, out=result[:, 5], where=epower != 0)
+        return result
 
-            term2 = data[il + co + 14] * t_suc ** 3 + data[il + co + 15] * t_con ** 3
+    def evaluate(self, speed, t_suction, t_condensation) -> CompressorOutput:
+        """
+        CompressorBackend: calculate_direct_batch als CompressorOutput; gültig sind Punkte innerhalb der
+        Einsatzgrenzen mit n1 <= speed <= n2. Die Zähler des speed_limiter bleiben unverändert.
+        """
+        speed, t_suction, t_condensation = (a.ravel() for a in np.broadcast_arrays(np.asarray(speed, dtype=float),
+                                                                                   np.asarray(t_suction, dtype=float),
+                                                                                   np.asarray(t_condensation, dtype=float)))
+        is_inside, n1, n2 = self.check_polygon_batch(t_suction, t_condensation)
+        return CompressorOutput.from_direct(self.calculate_direct_batch(speed, t_suction, t_condensation).T,
+                                            is_inside & (speed >= n1) & (speed <= n2))
+
+    def calculate_corrected(self, speed: float, t_suction: float, t_condensation: float,
+                            superheat: float) -> np.ndarray:
+        """
+        calculate_direct mit Überhitzungskorrektur aus dem Kennfeld (Bezug 10 K Überhitzung):
+        Massenstrom, Heißgastemperatur und Kälteleistung werden korrigiert, Heizleistung und COP
+        entsprechend nachgerechnet, elektrische Leistung und Strom bleiben unverändert.
+        """
+        if self.superheat_correction is None:
+            raise ValueError("EM_Compressor: Kennfeld enthält keine Überhitzungskorrektur")
+        f_massflow, dt_discharge, f_capacity = self.superheat_correction.interpolate_scalar(
+            t_suction, t_condensation, superheat)
+        result = self.calculate_direct(speed, t_suction, t_condensation)
+        qheat, epower, massflow, _, capacity, _, tdischarge, _ = result.tolist()
+        result[4] = capacity * f_capacity
+        result[0] = qheat + result[4] - capacity
+        result[2] = massflow * f_massflow
+        result[6] = tdischarge + dt_discharge
+        result[5] = result[0] / epower if epower != 0 else 0
+        return result
+
+    def calculate_corrected_batch(self, speed, t_suction, t_condensation, superheat) -> np.ndarray:
+        """ Vektorisierte Variante von calculate_corrected, Ergebnis (N, 8). """
+        if self.superheat_correction is None:
+            raise ValueError("EM_Compressor: Kennfeld enthält keine Überhitzungskorrektur")
+        speed, t_suction, t_condensation, superheat = np.broadcast_arrays(speed, t_suction, t_condensation, superheat)
+        correction = self.superheat_correction.interpolate(t_suction, t_condensation, superheat).reshape(-1, 3)
+        result = self.calculate_direct_batch(speed, t_suction, t_condensation)
+        comppower = result[:, 0] - result[:, 4]
+        result[:, 4] *= correction[:, 2]
+        result[:, 0] = result[:, 4] + comppower
+        result[:, 2] *= correction[:, 0]
+        result[:, 6] += correction[:, 1]
+        np.divide(result[:, 0], result[:, 1], out=result[:, 5], where=result[:, 1] != 0)
+        return result
+
+    def calculate_direct_with_jacobian(self, speed, t_suction, t_condensation) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Wie calculate_direct_batch, zusätzlich mit den exakten partiellen Ableitungen aus der Polynomstruktur.
+        Ergebnis: (values (N, 8), jacobian (N, 8, 3)) mit den Spalten d/d(speed), d/d(t_suction),
+        d/d(t_condensation); der COP wird nach der Quotientenregel abgeleitet (0 für epower = 0).
+        """
+        speed, t_suc, t_con = (a.ravel() for a in np.broadcast_arrays(np.asarray(speed, dtype=float),
+                                                                       np.asarray(t_suction, dtype=float),
+                                                                       np.asarray(t_condensation, dtype=float)))
+        values = self.calculate_direct_batch(speed, t_suc, t_con)
+        jacobian = np.einsum('nji,ki->nkj', monomial_basis_derivatives(speed, t_suc, t_con), self._output_matrix)
+
+        qheat = values[:, 0:1]
+        epower = values[:, 1:2]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            d_cop = (jacobian[:, 0, :] * epower - qheat * jacobian[:, 1, :]) / (epower * epower)
+        jacobian[:, 5, :] = np.where(epower != 0, d_cop, 0.0)
+        return values, jacobian
+
+    def speed_polynomial(self, t_suction, t_condensation) -> np.ndarray:
+        """
+        Bei festen Temperaturen ist jeder Ausgang von calculate_direct ein Polynom 2. Grades in der Drehzahl.
+        Liefert die Koeffizienten (a0, a1, a2) als (N, 8, 3)-Array; die COP-Zeile ist nicht polynomial und 0.
+        """
+        temps = monomial_basis(1.0, np.asarray(t_suction, dtype=float),
+                               np.asarray(t_condensation, dtype=float)).reshape(-1, 30)
+        return np.einsum('ni,pki->nkp', temps, self._speed_matrices)
+
+    def speed_for_qheat(self, q_target, t_suction, t_condensation) -> np.ndarray:
+        """
+        Drehzahl, bei der die Heizleistung qheat den Sollwert erreicht (Umkehrung von calculate_direct).
+        Ergebnis ist auf den Drehzahlbereich n1..n2 aus check_polygon begrenzt, außerhalb des
+        Kennfelds NaN. Eingänge werden gebroadcastet, Ergebnis ist ein Array der Länge N.
+        """
+        return self._speed_for_output(0, q_target, t_suction, t_condensation)
+
+    def speed_for_epower(self, p_target, t_suction, t_condensation) -> np.ndarray:
+        """ Wie speed_for_qheat, aber für die elektrische Leistungsaufnahme epower. """
+        return self._speed_for_output(1, p_target, t_suction, t_condensation)
+
+    def _speed_for_output(self, column: int, target, t_suction, t_condensation) -> np.ndarray:
+        target, t_suc, t_con = (a.ravel() for a in np.broadcast_arrays(np.asarray(target, dtype=float),
+                                                                       np.asarray(t_suction, dtype=float),
+                                                                       np.asarray(t_condensation, dtype=float)))
+        is_inside, n1, n2 = self.check_polygon_batch(t_suc, t_con)
+        a0, a1, a2 = np.moveaxis(self.speed_polynomial(t_suc, t_con)[:, column, :], -1, 0)
+        return np.where(is_inside, _solve_speed(a0, a1, a2, target, n1, n2), np.nan)
+
+    def slice_at(self, t_suction: float, t_condensation: float) -> 'OperatingSlice':
+        """
+        Reduziert das Kennfeld bei festen Temperaturen auf Polynome in der Drehzahl.
+        Koeffizienten und Drehzahlgrenzen werden einmal bestimmt, jede weitere
+        Drehzahlabfrage kostet nur noch wenige Multiplikationen.
+        """
+        is_inside, n1, n2 = self.check_polygon(t_suction, t_condensation)
+        temps = np.array(_monomial_terms(1.0, t_suction, t_condensation))
+        return OperatingSlice(t_suction, t_condensation, (self._speed_matrices @ temps).T, is_inside, n1, n2)
 
-            term3 = speed * (
-                    data[il + co + 16] + data[il + co + 17] * t_suc + data[il + co + 18] * t_con +
-                    data[il + co + 19] * t_suc ** 2 + data[il + co + 20] * t_con ** 2 +
-                    data[il + co + 21] * t_suc ** 3 + data[il + co + 22] * t_con ** 3
-            )
 
-            term4 = speed ** 2 * (
-                    data[il + co + 23] + data[il + co + 24] * t_suc + data[il + co + 25] * t_con +
-                    data[il + co + 26] * t_suc ** 2 + data[il + co + 27] * t_con ** 2 +
-                    data[il + co + 28] * t_suc ** 3 + data[il + co + 29] * t_con ** 3
-            )
+class FleetSpeedLimiter:
+    """
+    speed_limiter für viele Verdichter desselben Typs in einem Aufruf.
+    Die Zähler limit_speed, out_of_field und temporary_out_of_field liegen als Arrays je Einheit vor.
+    Statt einer Exception beim ersten Verdichter wird je Einheit ein Abschaltsignal (tripped) geliefert.
+    """
+
+    def __init__(self, compressor_map: CompressorMap, no_units: int, high_value_temporary_out_of_field: int = 300):
+        self.map = compressor_map
+        self.no_units = no_units
+        self.high_value_temporary_out_of_field = high_value_temporary_out_of_field
+        self.limit_speed = np.zeros(no_units, dtype=np.int64)
+        self.out_of_field = np.zeros(no_units, dtype=np.int64)
+        self.temporary_out_of_field = np.zeros(no_units, dtype=np.int64)
 
-            return base + term1 + term2 + term3 + term4
+    @classmethod
+    def from_type(cls, compressor_type: str, no_units: int,
+                  high_value_temporary_out_of_field: int = 300) -> 'FleetSpeedLimiter':
+        return cls(get_compressor_map(compressor_type), no_units, high_value_temporary_out_of_field)
+
+    def speed_limiter(self, speed, T_evaporation, T_condensing) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Begrenzt die Drehzahlen aller Einheiten wie Compressor.speed_limiter.
+        Eingänge haben die Länge no_units (oder werden darauf gebroadcastet).
+        Ergebnis: (begrenzte Drehzahlen, tripped) mit tripped = True für Einheiten, die
+        länger als high_value_temporary_out_of_field Zyklen außerhalb des Kennfelds liegen.
+        """
+        speed = np.broadcast_to(np.asarray(speed, dtype=float), (self.no_units,))
+        T_evaporation = np.broadcast_to(np.asarray(T_evaporation, dtype=float), (self.no_units,))
+        T_condensing = np.broadcast_to(np.asarray(T_condensing, dtype=float), (self.no_units,))
+        is_inside, n1, n2 = self.map.check_polygon_batch(T_evaporation, T_condensing)
 
-        # Hauptberechnungen
-        capacity = calculate_component(0, 0, speed, t_suction, t_condensation, poly_data)
-        epower = calculate_component(0, 30, speed, t_suction, t_condensation, poly_data)
-        ecurrent = calculate_component(0, 60, speed, t_suction, t_condensation, poly_data)
-        comppower = calculate_component(0, 30, speed, t_suction, t_condensation, poly_data)
-        massflow = calculate_component(0, 90, speed, t_suction, t_condensation, poly_data)
-        Tdischarge = calculate_component(0, 120, speed, t_suction, t_condensation, poly_data)
+        n_corr = np.where(is_inside, np.maximum(n1, np.minimum(speed, n2)), speed)
+        self.limit_speed += is_inside & (n_corr != speed)
+        self.temporary_out_of_field = np.where(is_inside, 0, self.temporary_out_of_field + 1)
+        self.out_of_field += ~is_inside
 
-        # Endberechnungen
-        qheat = capacity + comppower
-        cop = qheat / epower if epower != 0 else 0
-        invpower = epower - comppower
+        tripped = self.temporary_out_of_field > self.high_value_temporary_out_of_field
+        return n_corr, tripped
 
-        return np.array([qheat, epower, massflow, ecurrent, capacity, cop, Tdischarge, invpower])
+    def reset(self, units=None):
+        """ Setzt die Zähler aller bzw. der angegebenen Einheiten zurück. """
+        units = slice(None) if units is None else units
+        self.limit_speed[units] = 0
+        self.out_of_field[units] = 0
+        self.temporary_out_of_field[units] = 0
 
 
 # VZN175 = Compressor("json_data_cmp/VZN175.json")  # Achtung Pfad aus EM_HP geändert hier nur relativ
@@ -179,4 +1293,4 @@ if __name__ == '__main__':
     print(f"Stromaufnahme: {results[3]:.2f} A")
     print(f"Kälteleistung (capacity): {results[4]:.2f} W")
     print(f"Leistungszahl (COP): {results[5]:.2f}")
-    print(f"Endtemperatur (Tdischarge): {results[6]:.2f} C")
\ No newline at end of file
+    print(f"Endtemperatur (Tdischarge): {results[6]:.2f} C")
@@ -0,0 +1,188 @@
+"""
+Benchmark für das Equipment-Modul EM_Compressor.
+
+Misst calculate_direct, check_polygon, speed_limiter und das Laden der Kennfelder für
+VZN175 und VZN220 auf einem festen Gitter von Betriebspunkten (skalar und als Batch)
+und gibt ops/s mit Perzentilen der Zeit pro Operation aus.
+Zusätzlich wird die Importzeit der Laufzeit-, Legacy- und Offline-Module je in einem frischen Interpreter gemessen.
+
+Aufruf aus diesem Verzeichnis:
+    python EM_Compressor_benchmark.py --save-baseline      # Referenz speichern
+    python EM_Compressor_benchmark.py                      # mit Referenz vergleichen
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from EM_Compressor import BINARY_SUFFIX, MAP_DIRECTORY, Compressor, CompressorMap
+
+COMPRESSOR_TYPES = ("VZN175", "VZN220")
+DEFAULT_BASELINE = Path(__file__).parent / 'benchmark_baseline.json'  # maschinenabhängig, in .gitignore
+DEFAULT_THRESHOLD = 0.2  # 20 % weniger ops/s gilt als Regression
+
+# Importpfade: Laufzeit (nur NumPy), Legacy-Modelle (NumPy, pandas erst bei ungültigem CSV-Zwischenspeicher),
+# Offline-Werkzeuge zur Kennfelderzeugung (pandas, scipy, CoolProp)
+LEGACY_DIRECTORY = Path(__file__).parent / 'Ausgangsroutinen_und_Daten'
+IMPORT_PATHS = {
+    "runtime": "EM_Compressor",
+    "legacy": "TurboCor",
+    "offline_properties": "RefrigerantTables",
+    "offline_maps": "Make_json_Compressor_file",
+}
+HEAVY_PACKAGES = ("pandas", "scipy", "CoolProp")
+_IMPORT_SCRIPT = """
+import sys, time
+sys.path[:0] = {path!r}
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+print(','.join(sorted({{name.split('.')[0] for name in sys.modules}} & set({heavy!r}))))
+"""
+
+
+def operating_grid():
+    """ Festes Gitter: Drehzahl 30..140 rps, Verdampfung -30..25 °C, Kondensation 10..80 °C. """
+    speed, t_suc, t_con = np.meshgrid(np.arange(30.0, 141.0, 10.0),
+                                      np.arange(-30.0, 26.0, 5.0),
+                                      np.arange(10.0, 81.0, 5.0), indexing='ij')
+    return speed.ravel(), t_suc.ravel(), t_con.ravel()
+
+
+def time_call(function, ops_per_call: int, repeats: int) -> dict:
+    """
+    Führt function 'repeats'-mal aus und liefert ops/s (Median) sowie
+    Perzentile der Zeit pro Operation in Mikrosekunden.
+    """
+    function()  # Aufwärmen
+    per_op = np.empty(repeats)
+    for i in range(repeats):
+        start = time.perf_counter()
+        function()
+        per_op[i] = (time.perf_counter() - start) / ops_per_call
+    p50, p90, p99 = np.percentile(per_op, [50, 90, 99]) * 1e6
+    return {"ops_per_sec": 1e6 / p50, "p50_us": p50, "p90_us": p90, "p99_us": p99, "ops_per_call": ops_per_call}
+
+
+def time_import(module: str, repeats: int) -> dict:
+    """
+    Importzeit eines Moduls in jeweils einem frischen Interpreter (nach einem Aufwärmlauf für Bytecode
+    und Dateicache), Format wie time_call mit ops = 1 Import; zusätzlich die geladenen schweren Pakete.
+    """
+    script = _IMPORT_SCRIPT.format(path=[str(Path(__file__).parent), str(LEGACY_DIRECTORY)], module=module,
+                                   heavy=HEAVY_PACKAGES)
+    seconds = np.empty(repeats)
+    for i in range(repeats + 1):
+        output = subprocess.run([sys.executable, "-c", script], cwd=LEGACY_DIRECTORY, capture_output=True,
+                                text=True, check=True).stdout.splitlines()
+        if i > 0:
+            seconds[i - 1] = float(output[-2])
+    p50, p90, p99 = np.percentile(seconds, [50, 90, 99]) * 1e6
+    return {"ops_per_sec": 1e6 / p50, "p50_us": p50, "p90_us": p90, "p99_us": p99, "ops_per_call": 1,
+            "heavy_packages": output[-1]}
+
+
+def run_import_benchmarks(repeats: int = 3) -> dict:
+    return {f"import/{name}": time_import(module, repeats) for name, module in IMPORT_PATHS.items()}
+
+
+def run_benchmarks(repeats: int = 20) -> dict:
+    speed, t_suc, t_con = operating_grid()
+    points = list(zip(speed.tolist(), t_suc.tolist(), t_con.tolist()))
+    n = len(points)
+    results = {}
+
+    for compressor_type in COMPRESSOR_TYPES:
+        json_file_path = MAP_DIRECTORY / f'{compressor_type}.json'
+        binary_path = json_file_path.with_suffix(BINARY_SUFFIX)
+        with contextlib.redirect_stdout(io.StringIO()):
+            compressor = Compressor(compressor_map=CompressorMap.from_json(json_file_path),
+                                    high_value_temporary_out_of_field=10 ** 9)
+
+            def calculate_direct():
+                for p in points:
+                    compressor.calculate_direct(*p)
+
+            def check_polygon():
+                for _, ts, tc in points:
+                    compressor.check_polygon(ts, tc)
+
+            def speed_limiter():
+                for p in points:
+                    compressor.speed_limiter(*p)
+
+            cases = {
+                "calculate_direct": (calculate_direct, n),
+                "calculate_direct_batch": (lambda: compressor.calculate_direct_batch(speed, t_suc, t_con), n),
+                "evaluate": (lambda: compressor.evaluate(speed, t_suc, t_con), n),
+                "check_polygon": (check_polygon, n),
+                "check_polygon_batch": (lambda: compressor.check_polygon_batch(t_suc, t_con), n),
+                "speed_limiter": (speed_limiter, n),
+                "load_json": (lambda: CompressorMap.from_json(json_file_path), 1),
+            }
+            if binary_path.exists():
+                cases["load_binary"] = (lambda: CompressorMap.from_binary(binary_path,
+                                                                          json_file_path=json_file_path), 1)
+
+            for name, (function, ops) in cases.items():
+                results[f"{compressor_type}/{name}"] = time_call(function, ops, repeats)
+
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """ Liefert die Namen aller Messungen, deren ops/s mehr als 'threshold' unter der Referenz liegen. """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is not None and result["ops_per_sec"] < reference["ops_per_sec"] * (1.0 - threshold):
+            regressions.append(name)
+    return regressions
+
+
+def print_results(results: dict, baseline: dict = None):
+    print(f"{'Messung':38s} {'ops/s':>12s} {'p50 us':>10s} {'p90 us':>10s} {'p99 us':>10s} {'vs. Ref.':>9s}")
+    for name, r in results.items():
+        ratio = ""
+        if baseline and name in baseline:
+            ratio = f"{r['ops_per_sec'] / baseline[name]['ops_per_sec']:8.2f}x"
+        print(f"{name:38s} {r['ops_per_sec']:12.0f} {r['p50_us']:10.3f} {r['p90_us']:10.3f} {r['p99_us']:10.3f} "
+              f"{ratio:>9s} {r.get('heavy_packages', '')}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark EM_Compressor")
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Ergebnis als neue Referenz speichern")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="zulässiger Rückgang der ops/s gegenüber der Referenz (0.2 = 20 %%)")
+    parser.add_argument("--import-repeats", type=int, default=3, help="Interpreterstarts je Importpfad, 0 = aus")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.repeats)
+    if args.import_repeats > 0:
+        results.update(run_import_benchmarks(args.import_repeats))
+    baseline = None
+    if args.baseline.exists() and not args.save_baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)["results"]
+    print_results(results, baseline)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump({"python": platform.python_version(), "numpy": np.__version__,
+                       "machine": platform.platform(), "results": results}, f, indent=4)
+        print(f"Referenz gespeichert: {args.baseline}")
+    elif baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        for name in regressions:
+            print(f"REGRESSION: {name} mehr als {args.threshold:.0%} langsamer als die Referenz")
+        raise SystemExit(1 if regressions else 0)
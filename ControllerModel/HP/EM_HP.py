@@ -1,6 +1,5 @@
 # Import der bereitgestellten EM-Klassen
 
-from pathlib import Path
 from ControllerModel.EM_Compressor import EM_Compressor
 from ControllerModel.EM_Expansion_valve.EM_Expansion_valve_PDext_testdrv import Expansion_valve
 from ControllerModel.EM_Airflow.EM_Airflow import Airflow,FM2_AF_model
@@ -33,11 +32,8 @@ class HP:
         self.name = name
 
         # Komponenten als Attribute der HP-Klasse initialisieren
-        # 1. Kompressor
-        project_root = Path(__file__).parent.parent
-        json_file_path = project_root / 'EM_Compressor' / 'json_data_cmp' / 'VZN175.json'
-
-        self.compressor = EM_Compressor.Compressor(json_file_path)
+        # 1. Kompressor - Kennfeld aus dem gemeinsamen Register, Begrenzer-Zähler je HP
+        self.compressor = EM_Compressor.Compressor.from_type(compressor_type)
 
         # 2. Expansionsventil
         self.expansion_valve = Expansion_valve()   # PD Controller